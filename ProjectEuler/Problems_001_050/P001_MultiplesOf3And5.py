@@ -5,6 +5,8 @@ The sum of these multiples is 23.
 
 Find the sum of all the multiples of 3 or 5 below 1000.
 """
+import math
+import sys
 
 
 def multiples_of_3_5(stop):
@@ -28,9 +30,46 @@ def multiples_of_3_5(stop):
     return s
 
 
+def inclusion_exclusion_terms(divisors, limit):
+    """
+    Build inclusion-exclusion terms (lcm, sign) for numbers up to limit divisible by any of the divisors
+    (as core.inclusion_exclusion_terms). Subsets with lcm > limit are pruned with all their supersets.
+    """
+    reduced = []
+    for divisor in sorted(set(divisors)):
+        if divisor <= limit and all(divisor % smaller for smaller in reduced):
+            reduced.append(divisor)
+    terms = []
+    stack = [(0, 1, 1)]
+    while stack:
+        start, lcm, sign = stack.pop()
+        for index in range(start, len(reduced)):
+            divisor = reduced[index]
+            new_lcm = lcm // math.gcd(lcm, divisor) * divisor
+            if new_lcm <= limit:
+                terms.append((new_lcm, sign))
+                stack.append((index + 1, new_lcm, -sign))
+    return terms
+
+
+def multiples_sum(terms, stop):
+    """Compute sum numbers in range(1, stop) divisible by any divisor using closed form for every term."""
+    last = stop - 1
+    total = 0
+    for lcm, sign in terms:
+        multiples = last // lcm
+        total += sign * lcm * multiples * (multiples + 1)
+    return total // 2
+
+
+def hacker_main(divisors=(3, 5)):
+    """Read all stop values at once, build terms once for the divisor set and write answers in one buffer."""
+    data = sys.stdin.buffer.read().split()
+    stops = [int(stop) for stop in data[1:int(data[0]) + 1]]
+    terms = inclusion_exclusion_terms(divisors, max(stops, default=1) - 1)
+    sys.stdout.write('\n'.join(str(multiples_sum(terms, stop)) for stop in stops) + '\n')
+
+
 if __name__ == "__main__":
     # print(multiples_of_3_5(1000))
-    t = int(input().strip())
-    for _ in range(t):
-        n = int(input().strip())
-        print(multiples_of_3_5(n))
+    hacker_main()
@@ -6,8 +6,8 @@ Each new term in the Fibonacci sequence is generated by adding the previous two
 
 By considering the terms in the Fibonacci sequence whose values do not exceed four million, find the sum of the even-valued terms.
 """
-
-from itertools import takewhile
+import sys
+from bisect import bisect_left
 
 
 def fibonacci():
@@ -20,8 +20,41 @@ def fibonacci():
         yield j
 
 
-# print(sum([i for i in takewhile(lambda x: x < 4000000, fibonacci()) if i % 2 == 0]))
-t = int(input().strip())
-for _ in range(t):
-    n = int(input().strip())
-    print(sum([i for i in takewhile(lambda x: x < n, fibonacci()) if i % 2 == 0]))
+def even_fibonacci(limit):
+    """
+    Even Fibonacci numbers E(0) = 0, E(1) = 2, E(2) = 8, ... up to the first one bigger than limit.
+    Every third Fibonacci number is even and E(k) = 4 * E(k - 1) + E(k - 2).
+    """
+    evens = [0, 2]
+    while evens[-1] <= limit:
+        evens.append(4 * evens[-1] + evens[-2])
+    return evens
+
+
+def even_fibonacci_sum(evens, k):
+    """Sum of k first even Fibonacci numbers in closed form: E(1) + ... + E(k) = (E(k + 1) + E(k) - 2) / 4."""
+    return (evens[k + 1] + evens[k] - 2) // 4
+
+
+def hacker_main():
+    """
+    Read all queries at once, build even Fibonacci numbers once for the biggest one and write one buffer.
+    Queries share a few thousands of cutoffs, so answers are converted to text once per cutoff.
+    """
+    data = sys.stdin.buffer.read().split()
+    queries = [int(n) for n in data[1:int(data[0]) + 1]]
+    evens = even_fibonacci(max(queries, default=0))
+    answers = {}
+    output = []
+    for n in queries:
+        # even Fibonacci numbers below n
+        k = max(bisect_left(evens, n) - 1, 0)
+        if k not in answers:
+            answers[k] = str(even_fibonacci_sum(evens, k))
+        output.append(answers[k])
+    sys.stdout.write('\n'.join(output) + '\n')
+
+
+if __name__ == "__main__":
+    # print(sum([i for i in takewhile(lambda x: x < 4000000, fibonacci()) if i % 2 == 0]))
+    hacker_main()
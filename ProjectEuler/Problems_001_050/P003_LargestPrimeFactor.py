@@ -5,7 +5,16 @@ The prime factors of 13195 are 5, 7, 13 and 29.
 What is the largest prime factor of the number 600851475143 ?
 """
 
+import itertools
 import math
+import sys
+from functools import lru_cache
+
+# Witnesses making Miller-Rabin test deterministic for all numbers < 2 ** 64
+MILLER_RABIN_WITNESSES_64 = (2, 325, 9375, 28178, 450775, 9780504, 1795265022)
+TRIAL_DIVISION_PRIMES = tuple(p for p in range(2, 1000) if all(p % d for d in range(2, math.isqrt(p) + 1)))
+TRIAL_DIVISION_PRODUCT = math.prod(TRIAL_DIVISION_PRIMES)
+FACTORIZATION_CACHE_SIZE = 1 << 14
 
 
 def largest_prime_factor(n):
@@ -26,8 +35,91 @@ def largest_prime_factor(n):
     return n
 
 
-# print(largest_prime_factor(600851475143))
-t = int(input().strip())
-for _ in range(t):
-    n = int(input().strip())
-    print(largest_prime_factor(n))
+def is_probable_prime(num):
+    """Deterministic Miller-Rabin for odd num < 2 ** 64, probable prime test above (as core)."""
+    s, d = 0, num - 1
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for base in MILLER_RABIN_WITNESSES_64:
+        x = pow(base, d, num)
+        if x in (0, 1, num - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % num
+            if x == num - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def pollard_brent(num):
+    """Find non-trivial divisor of odd composite num using Brent variant of Pollard rho (as core)."""
+    batch = 128
+    for c in itertools.count(1):
+        y, power, product, divisor = 2, 1, 1, 1
+        x = saved_y = y
+        while divisor == 1:
+            x = y
+            for _ in range(power):
+                y = (y * y + c) % num
+            k = 0
+            while k < power and divisor == 1:
+                saved_y = y
+                for _ in range(min(batch, power - k)):
+                    y = (y * y + c) % num
+                    product = product * abs(x - y) % num
+                divisor = math.gcd(product, num)
+                k += batch
+            power *= 2
+        if divisor == num:
+            # batch overshoot - repeat the last batch step by step
+            divisor = 1
+            while divisor == 1:
+                saved_y = (saved_y * saved_y + c) % num
+                divisor = math.gcd(abs(x - saved_y), num)
+        if divisor != num:
+            return divisor
+
+
+@lru_cache(maxsize=FACTORIZATION_CACHE_SIZE)
+def largest_prime_factor_fast(num):
+    """
+    Find largest prime divisor (as core.largest_prime_factor).
+    Small primes are removed by trial division (gcd with their product skips it for most numbers),
+    cofactor is verified by Miller-Rabin and split by Pollard rho, recent results are kept in LRU cache.
+    """
+    assert num > 0
+    largest = 1
+    small_part = math.gcd(num, TRIAL_DIVISION_PRODUCT)
+    for prime in TRIAL_DIVISION_PRIMES:
+        if small_part == 1:
+            break
+        if small_part % prime == 0:
+            small_part //= prime
+            largest = prime
+            while num % prime == 0:
+                num //= prime
+    pending = [num] if num > 1 else []
+    while pending:
+        num = pending.pop()
+        if num < TRIAL_DIVISION_PRIMES[-1] ** 2 or is_probable_prime(num):
+            largest = max(largest, num)
+            continue
+        root = math.isqrt(num)
+        divisor = root if root * root == num else pollard_brent(num)
+        pending += [divisor, num // divisor]
+    return largest
+
+
+def hacker_main():
+    """Read all queries at once and write all answers in one buffer."""
+    data = sys.stdin.buffer.read().split()
+    queries = [int(n) for n in data[1:int(data[0]) + 1]]
+    sys.stdout.write('\n'.join(str(largest_prime_factor_fast(n)) for n in queries) + '\n')
+
+
+if __name__ == "__main__":
+    # print(largest_prime_factor(600851475143))
+    hacker_main()
@@ -5,6 +5,16 @@ The largest palindrome made from the product of two 2-digit numbers is 9009 = 91
 
 Find the largest palindrome made from the product of two 3-digit numbers which is less than given number n.
 """
+import itertools
+import math
+import sys
+from collections import Counter
+
+# Witnesses making Miller-Rabin test deterministic for all numbers < 2 ** 64
+MILLER_RABIN_WITNESSES_64 = (2, 325, 9375, 28178, 450775, 9780504, 1795265022)
+TRIAL_DIVISION_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71, 73, 79, 83, 89, 97)
+# Divisor ranges longer than that are verified by factorization instead of trial division
+DIVISOR_RANGE_LIMIT = 5000
 
 
 def is_3x3_digit_product(num):
@@ -30,8 +40,168 @@ def find_palindrome(n):
             return p
 
 
-# print(find_palindrome(999999))
-t = int(input().strip())
-for _ in range(t):
-    n = int(input().strip())
-    print(find_palindrome(n))
+def is_probable_prime(num):
+    """Deterministic Miller-Rabin for odd num < 2 ** 64 (as core)."""
+    s, d = 0, num - 1
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for base in MILLER_RABIN_WITNESSES_64:
+        x = pow(base, d, num)
+        if x in (0, 1, num - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % num
+            if x == num - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def pollard_brent(num):
+    """Find non-trivial divisor of odd composite num using Brent variant of Pollard rho (as core)."""
+    batch = 128
+    for c in itertools.count(1):
+        y, power, product, divisor = 2, 1, 1, 1
+        x = saved_y = y
+        while divisor == 1:
+            x = y
+            for _ in range(power):
+                y = (y * y + c) % num
+            k = 0
+            while k < power and divisor == 1:
+                saved_y = y
+                for _ in range(min(batch, power - k)):
+                    y = (y * y + c) % num
+                    product = product * abs(x - y) % num
+                divisor = math.gcd(product, num)
+                k += batch
+            power *= 2
+        if divisor == num:
+            # batch overshoot - repeat the last batch step by step
+            divisor = 1
+            while divisor == 1:
+                saved_y = (saved_y * saved_y + c) % num
+                divisor = math.gcd(abs(x - saved_y), num)
+        if divisor != num:
+            return divisor
+
+
+def divisors_of(num):
+    """Return all divisors of num built from factorization by trial division, Miller-Rabin and Pollard rho."""
+    factors = []
+    for prime in TRIAL_DIVISION_PRIMES:
+        while num % prime == 0:
+            factors.append(prime)
+            num //= prime
+    pending = [num] if num > 1 else []
+    while pending:
+        num = pending.pop()
+        if num < 101 * 101 or is_probable_prime(num):
+            factors.append(num)
+            continue
+        root = math.isqrt(num)
+        divisor = root if root * root == num else pollard_brent(num)
+        pending += [divisor, num // divisor]
+    divisors = [1]
+    for prime, power in Counter(factors).items():
+        divisors = [d * prime ** k for d in divisors for k in range(power + 1)]
+    return divisors
+
+
+# Palindrome status in PalindromeProducts index
+UNKNOWN, PRODUCT, NOT_PRODUCT = 0, 1, 2
+
+
+class PalindromeProducts:
+    """
+    Index of palindromes being products of two d-digit numbers (they have 2d - 1 or 2d digits).
+    Palindromes of given length are indexed by their left half, status of every palindrome is kept in bytearray:
+    unknown, product or not product. Palindrome is classified once when query reaches it, so the index is built
+    lazily only where queries need it. Query for the largest product below n scans statuses downward with rfind:
+    the nearest known product is the answer when there is no unknown palindrome between.
+    """
+
+    def __init__(self, digits):
+        self.low, self.high = 10 ** (digits - 1), 10 ** digits - 1
+        self.lengths = (2 * digits, 2 * digits - 1)
+        self.status = {}
+
+    @staticmethod
+    def _palindrome(left, length):
+        """Build palindrome of given length from its left half."""
+        text = str(left)
+        return int(text + text[-1 - length % 2::-1])
+
+    def _is_product(self, p):
+        """Verify that p is product of two d-digit numbers checking only factors in divisor range."""
+        low, high = self.low, self.high
+        start, stop = max(low, -(-p // high)), min(high, p // low)
+        if p % 11 == 0 and stop - start < 11 * DIVISOR_RANGE_LIMIT:
+            # 11 is prime so one of factors x is multiple of 11: low <= x <= high, low <= p / x <= high
+            return any(p % x == 0 for x in range(stop - stop % 11, start - 1, -11))
+        # the bigger factor a: sqrt(p) <= a <= high, p / a >= low
+        start = max(start, math.isqrt(p - 1) + 1)
+        if stop - start < DIVISOR_RANGE_LIMIT:
+            return any(p % a == 0 for a in range(stop, start - 1, -1))
+        return any(start <= divisor <= stop for divisor in divisors_of(p))
+
+    def _below_with_length(self, n, length):
+        """Return the largest palindrome product with given length smaller than n or None."""
+        half = (length + 1) // 2
+        first = 10 ** (half - 1)
+        if n <= self._palindrome(first, length):
+            return None
+        # the biggest left half making palindrome < n
+        left = min(n // 10 ** (length - half), 10 ** half - 1)
+        if self._palindrome(left, length) >= n:
+            left -= 1
+        if length not in self.status:
+            self.status[length] = bytearray(9 * first)
+        status = self.status[length]
+        position = left - first
+        while True:
+            # palindromes between unknown and position are already classified
+            unknown = status.rfind(UNKNOWN, 0, position + 1)
+            found = status.rfind(PRODUCT, unknown + 1, position + 1)
+            if found < 0 and unknown >= 0:
+                p = self._palindrome(first + unknown, length)
+                status[unknown] = PRODUCT if self._is_product(p) else NOT_PRODUCT
+                found = unknown if status[unknown] == PRODUCT else -1
+                position = unknown
+            if found >= 0:
+                return self._palindrome(first + found, length)
+            if unknown < 0:
+                return None
+
+    def below(self, n):
+        """Return the largest palindrome product smaller than n or None."""
+        for length in self.lengths:
+            if n > 10 ** (length - 1):
+                result = self._below_with_length(min(n, 10 ** length), length)
+                if result is not None:
+                    return result
+        return None
+
+
+palindrome_products = {}
+
+
+def find_palindrome_product(n, digits=3):
+    """Find the largest palindrome product of two digits-digit numbers smaller than n, index is built per digits."""
+    if digits not in palindrome_products:
+        palindrome_products[digits] = PalindromeProducts(digits)
+    return palindrome_products[digits].below(n)
+
+
+def hacker_main():
+    """Read all queries at once and write all answers in one buffer."""
+    data = sys.stdin.buffer.read().split()
+    queries = [int(n) for n in data[1:int(data[0]) + 1]]
+    sys.stdout.write('\n'.join(str(find_palindrome_product(n)) for n in queries) + '\n')
+
+
+if __name__ == "__main__":
+    # print(find_palindrome(999999))
+    hacker_main()
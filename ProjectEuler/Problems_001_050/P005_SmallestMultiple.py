@@ -16,8 +16,30 @@ def smallest_multiple(n):
     return multiple
 
 
+def smallest_multiples(limit):
+    """
+    Smallest multiples of 1..n for all n <= limit (prefix table as core.LcmTable).
+    lcm(1..n) changes only for n == p ** k, it is multiplied by p then.
+    Prime powers are marked from Eratosthenes sieve primes - O(limit log log limit).
+    """
+    sieve = bytearray([1]) * (limit + 1)
+    factor = [1] * (limit + 1)  # factor[p ** k] == p, 1 for other numbers
+    for prime in range(2, limit + 1):
+        if sieve[prime]:
+            sieve[prime * prime::prime] = bytes(len(range(prime * prime, limit + 1, prime)))
+            power = prime
+            while power <= limit:
+                factor[power] = prime
+                power *= prime
+    table = [1] * (limit + 1)
+    for n in range(2, limit + 1):
+        table[n] = table[n - 1] * factor[n] if factor[n] > 1 else table[n - 1]
+    return table
+
+
 # print(smallest_multiple(20))
 t = int(input().strip())
-for _ in range(t):
-    n = int(input().strip())
-    print(smallest_multiple(n))
+queries = [int(input().strip()) for _ in range(t)]
+multiples = smallest_multiples(max(queries, default=1))
+for n in queries:
+    print(multiples[n])
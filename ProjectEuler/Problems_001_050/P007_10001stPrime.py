@@ -5,28 +5,40 @@ By listing the first six prime numbers: 2, 3, 5, 7, 11, and 13, we can see that
 What is the 10 001st prime number?
 """
 import math
+import sys
 
-MAX_PRIME_NUMBER = 10001
-APPROX_ERROR = 0.15
-SIEVE_SIZE = int(math.log(MAX_PRIME_NUMBER) * (1+APPROX_ERROR) * MAX_PRIME_NUMBER) + 1
-sieve = [0] * SIEVE_SIZE
-primes = [0, 2]
 
+def nth_prime_upper_bound(n):
+    """Rosser bound p(n) <= n * (ln n + ln ln n) for n >= 6 (as core.nth_prime_bounds)."""
+    if n < 6:
+        return 11
+    log_n = math.log(n)
+    return math.ceil(n * (log_n + math.log(log_n)))
 
-def eratosthenes_sieve(arr):
-    for i in range(3, SIEVE_SIZE, 2):
-        if arr[i] == 0:
-            primes.append(i)
-            for j in range(i + i, SIEVE_SIZE, i):
-                arr[j] = 1
 
+def first_primes(n):
+    """Return [0] followed by the first n primes, odd-only sieve is sized exactly by upper bound of n-th prime."""
+    limit = nth_prime_upper_bound(n)
+    # sieve[i] represents 2 * i + 1
+    sieve = bytearray([1]) * (limit // 2 + 1)
+    sieve[0] = 0
+    for i in range(1, (math.isqrt(limit) - 1) // 2 + 1):
+        if sieve[i]:
+            p = 2 * i + 1
+            sieve[p * p // 2::p] = bytes(len(range(p * p // 2, len(sieve), p)))
+    primes = [0, 2]
+    primes.extend(2 * i + 1 for i, flag in enumerate(sieve) if flag)
+    return primes[:n + 1]
 
-if __name__ == "__main__":
-    eratosthenes_sieve(sieve)
-    # print(primes[10001])
-    t = int(input().strip())
-    for _ in range(t):
-        n = int(input().strip())
-        print(primes[n])
+
+def hacker_main():
+    """Read all queries at once, sieve once for the biggest one and write all answers in one buffer."""
+    data = sys.stdin.buffer.read().split()
+    queries = [int(n) for n in data[1:int(data[0]) + 1]]
+    primes = first_primes(max(queries, default=1))
+    sys.stdout.write('\n'.join(str(primes[n]) for n in queries) + '\n')
 
 
+if __name__ == "__main__":
+    # print(first_primes(10001)[10001])
+    hacker_main()
@@ -5,11 +5,9 @@ The Fibonacci sequence is defined by the recurrence relation: F(n) = F(n-1) + F(
 What is the first term in the Fibonacci sequence to contain Nth digits?
 
 """
+import math
 from itertools import takewhile
 
-MAX_DIGITS = 5001
-fibonacci_index = [0] * (MAX_DIGITS + 1)
-
 
 def fibonacci():
     """
@@ -37,21 +35,40 @@ def fibonacci_first_with_n_digits(n):
     return sum(1 for i in takewhile(lambda f: f < num, fibonacci()))
 
 
-def init():
-    next_len = 1
-    next_power = 1
-    for ndx, fib in enumerate(fibonacci(), 0):
-        if next_len > MAX_DIGITS:
-            break
-        if fib > next_power and fibonacci_index[next_len] == 0:
-            fibonacci_index[next_len] = ndx
-            next_len += 1
-            next_power *= 10
+def fib_pair(n):
+    """Compute (F(n), F(n + 1)) by fast doubling (as core.fib_pair)."""
+    f_current, f_next = 0, 1
+    for bit in bin(n)[2:]:
+        f_double = f_current * (2 * f_next - f_current)
+        f_double_next = f_current * f_current + f_next * f_next
+        if bit == '1':
+            f_current, f_next = f_double_next, f_double + f_double_next
+        else:
+            f_current, f_next = f_double, f_double_next
+    return f_current, f_next
+
+
+def fib_index_with_digits(d):
+    """
+    Index of the first Fibonacci number with d digits (as core.fib_index_with_digits).
+    Binet's formula estimate corrected by exact check of F(n - 1) < 10 ** (d - 1) <= F(n).
+    """
+    if d == 1:
+        return 1
+    bound = 10 ** (d - 1)
+    n = math.ceil(((d - 1) * math.log(10) + math.log(5) / 2) / math.log((1 + math.sqrt(5)) / 2))
+    f_previous, f_current = fib_pair(n - 1)
+    while f_current < bound:
+        f_previous, f_current = f_current, f_previous + f_current
+        n += 1
+    while f_previous >= bound:
+        f_previous, f_current = f_current - f_previous, f_previous
+        n -= 1
+    return n
 
 
-init()
 # print(fibonacci_first_with_n_digits(1000))
 t = int(input())
 for _ in range(t):
     n = int(input())
-    print(fibonacci_index[n])
\ No newline at end of file
+    print(fib_index_with_digits(n))
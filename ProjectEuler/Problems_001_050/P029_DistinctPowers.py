@@ -246,6 +246,37 @@ def distinct_powers(num):
     return counter
 
 
+def count_distinct_powers(n):
+    """
+    Count distinct a ** b for 2 <= a, b <= n (as core.count_distinct_powers).
+    Bases are grouped by perfect power root r: r, r ** 2, ..., r ** k <= n give distinct products i * b,
+    1 <= i <= k, 2 <= b <= n. Counts for every level k are collected once in a bitset of products.
+    """
+    if n < 2:
+        return 0
+    root = math.isqrt(n)
+    is_power = bytearray(n + 1)
+    levels = Counter()
+    for r in range(2, root + 1):
+        if not is_power[r]:
+            k, power = 1, r * r
+            while power <= n:
+                is_power[power] = 1
+                k, power = k + 1, power * r
+            levels[k] += 1
+    # roots bigger than sqrt(n) are on level 1
+    levels[1] += n - root - is_power.count(1, root + 1)
+    max_level = max(levels)
+    seen = bytearray(max_level * n + 1)
+    products = [0] * (max_level + 1)
+    ones = b'\x01' * (n - 1)
+    for i in range(1, max_level + 1):
+        level_slice = slice(2 * i, i * n + 1, i)
+        products[i] = products[i - 1] + n - 1 - seen[level_slice].count(1)
+        seen[level_slice] = ones
+    return sum(products[k] * count for k, count in levels.items())
+
+
 # print(distinct_powers(100))
 n = int(input())
-print(distinct_powers(n))
+print(count_distinct_powers(n))
@@ -9,120 +9,55 @@ NOTE: 2, 3, 5, and 7 are not considered to be truncatable primes.
 
 """
 from itertools import product
-import itertools
 import math
-from functools import reduce
-from typing import Iterator, Iterable
+from typing import Iterator
 
 
-def divisors(num: int, *, start: int = 2, ordered: bool = False, step: int = 1) -> Iterator[int]:
-    """
-    Get all number divisors starting from start.
-    Faster (sqrt(n) operations) than scanning all numbers using:
-        divisors = (i for i in range(start, n) if n % mod i == 0).
-    :param step: step for verifying sequence of divisors (1= all numbers, 2 - odd numbers)
-    :param num: number for which we yields divisors
-    :param ordered: if True divisors yields in increasing order
-        using list keeping half of the divisors.
-        For ordered=True risk of memory overflow for huge numbers with few thousands digits
-    :param start: starting number for divisor.
-        Most frequent use:
-            start=2 yields all divisors excluding 1 and n -  it will contains nothing for prime num
-            start=1 yields all divisors including 1 and n -  it will contain 1 and num for prime num
-            start is used for step by step number factorization
-            (finding number representation as prime number product)
-    :yields: num divisors
-    """
-
-    def _divisors():
-        # Step 1:
-        # Process divisible by 1 only when start == 1
-        if start == 1:
-            yield 1
-            # prevent yield duplicate when num == 1
-            if num > 1:
-                yield num
-
-        # Step 2:
-        # Process divisibility in up to sqrt_num[+1]
-        # - from 2 (1 already processed) or from start if greater then 2
-        # - to sqrt_num if sqrt_num is exact square of num or once more otherwise
-        for next_num in range(max(2, start), sqrt_num + no_int_sqrt, step):
-            if num % next_num == 0:
-                yield next_num
-                yield num // next_num
-
-        # Step 3:
-        # Process when sqrt_num is exact sqrt of num except 1 which was already processed in step 1
-        if no_int_sqrt == 0 and num > 1:
-            yield sqrt_num
-
-    def _sorted(iterable: Iterable[int]):
-        # Divisor are not generated in sorted order. E.g. for 12 it is: 1, 12, 2, 6, 3, 4.
-        # Odd elements are increasing, even elements are decreasing
-        # Make stack for half of divisors if ordered list of divisors is requested
-        divisors_stack: list[int] = []
-        iterator = iter(iterable)
-
-        try:
-            previous = next(iterator)
-        except StopIteration:
-            return
-
-        for current in iterator:
-            if previous > current:
-                # Send even element on stack
-                divisors_stack.append(previous)
-            else:
-                # Yield odd element
-                yield previous
-            previous = current
-        # Yield last ordered element
-        yield previous
-
-        # Yield elements from stack
-        for divisor in reversed(divisors_stack):
-            yield divisor
-
-    assert num > 0, "divisors iterator works with num > 0"
-    assert start > 0, "divisors iterator works with start > 0"
-
-    # find divisors until sqrt(num)
-    sqrt_num: int = int(math.sqrt(num))
-    # Is exact num sqrt?
-    if sqrt_num * sqrt_num == num:
-        no_int_sqrt = 0
-    else:
-        no_int_sqrt = 1
-
-    if ordered:
-        yield from _sorted(_divisors())
-    else:
-        yield from _divisors()
+WHEEL_30_GAPS = (4, 2, 4, 2, 4, 6, 2, 6)  # gaps between numbers co-prime to 30 starting from 7
+TRIAL_CUTOFF = 1000  # the biggest divisor verified by trial division
+# Witnesses making Miller-Rabin test deterministic for all numbers < 2 ** 64
+MILLER_RABIN_WITNESSES_64 = (2, 325, 9375, 28178, 450775, 9780504, 1795265022)
 
 
 def is_prime(num: int) -> bool:
     """
     Verify if num is prime
+    Mod 30 wheel trial division up to TRIAL_CUTOFF, then deterministic Miller-Rabin (as core.is_prime).
     :param num:
     :return: True if prime, False otherwise
     """
-    assert num >= 1
-
-    if num == 1:
+    if num < 2:
         return False
-
-    if num == 2:
+    for prime in (2, 3, 5):
+        if num % prime == 0:
+            return num == prime
+
+    sqrt_num = math.isqrt(num)
+    divisor_limit = min(sqrt_num, TRIAL_CUTOFF)
+    divisor, index = 7, 0
+    while divisor <= divisor_limit:
+        if num % divisor == 0:
+            return False
+        divisor += WHEEL_30_GAPS[index]
+        index = (index + 1) % 8
+    if sqrt_num <= TRIAL_CUTOFF:
         return True
 
-    if num % 2 == 0:
-        return False
-
-    for _ in divisors(num, start=3, step=2):
-        # try to get first divisor
-        return False
-
-    # if no divisors, than prime
+    # Factor n-1 as d * 2 ** s
+    s, d = 0, num - 1
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for base in MILLER_RABIN_WITNESSES_64:
+        x = pow(base, d, num)
+        if x in (0, 1, num - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % num
+            if x == num - 1:
+                break
+        else:
+            return False
     return True
 
 
@@ -14,6 +14,7 @@ the numerator of the fraction immediately to the left of 3/7.
 
 """
 import math
+import sys
 from fractions import Fraction
 
 
@@ -24,10 +25,15 @@ def eegcd(a, b):
     a * b // g = LCM(a, b)
     g = a * x + b * y
     """
-    if a == 0:
-        return b, 0, 1
-    g, y, x = eegcd(b % a, a)
-    return g, x - (b // a) * y, y
+    old_r, r = a, b
+    old_x, x = 1, 0
+    old_y, y = 0, 1
+    while r:
+        quotient = old_r // r
+        old_r, r = r, old_r - quotient * r
+        old_x, x = x, old_x - quotient * x
+        old_y, y = y, old_y - quotient * y
+    return old_r, old_x, old_y
 
 
 def find_naive(a, b, n):
@@ -203,9 +209,42 @@ test_n = 1000000
 # exit()
 
 
-t = int(input())
-for _ in range(t):
-    a, b, n = map(int, input().split())
-    find_fast(a, b, n)
-    print(c, d)
+def farey_neighbours(a, b, n):
+    """
+    Find left and right neighbour of a / b in Farey sequence of order n in O(log b) (as core.farey_neighbours).
+    Stern-Brocot descent moves bound L (or R) by k mediant steps at once.
+    """
+    divisor = math.gcd(a, b)
+    a, b = a // divisor, b // divisor
+    lp, lq, rp, rq = 0, 1, 1, 0
+    while lq + rq <= n:
+        mp, mq = lp + rp, lq + rq
+        if mp * b < a * mq:
+            k = (a * lq - lp * b - 1) // (rp * b - a * rq)
+            if rq:
+                k = min(k, (n - lq) // rq)
+            lp, lq = lp + k * rp, lq + k * rq
+        elif mp * b > a * mq:
+            k = min((rp * b - a * rq - 1) // (a * lq - lp * b), (n - rq) // lq)
+            rp, rq = rp + k * lp, rq + k * lq
+        else:
+            k_left, k_right = (n - lq) // b, (n - rq) // b
+            return (lp + k_left * a, lq + k_left * b), (rp + k_right * a, rq + k_right * b)
+    return (lp, lq), (rp, rq)
+
+
+def hacker_main():
+    """Read all 'a b n' queries at once and write all left neighbours in one buffer."""
+    data = sys.stdin.buffer.read().split()
+    t = int(data[0])
+    queries = map(int, data[1:3 * t + 1])
+    output = []
+    for a, b, n in zip(queries, queries, queries):
+        (c, d), _ = farey_neighbours(a, b, n)
+        output.append(f'{c} {d}')
+    sys.stdout.write('\n'.join(output) + '\n')
+
+
+if __name__ == "__main__":
+    hacker_main()
 
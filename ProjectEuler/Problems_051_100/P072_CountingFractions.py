@@ -32,6 +32,10 @@ It can be seen that n=6 produces a maximum n/phi(n) for n <= 10.
 Find the value of n <= 1,000,000 for which n/phi(n) is a maximum.
 
 """
+import itertools
+import math
+import sys
+from array import array
 
 
 def rationals_sieve(n):
@@ -68,9 +72,57 @@ def rationals_sieve(n):
     return numbers
 
 
-tot_array = rationals_sieve(10**6 + 1)
-t = int(input())
-for _ in range(t):
-    n = int(input())
-    print(tot_array[n])
+def phi_table(n):
+    """Euler totient for 0..n - for every prime p all multiples x are updated by slice: phi -= phi // p."""
+    phi = list(range(n + 1))
+    for i in range(2, n + 1):
+        if phi[i] == i:
+            # i is prime - not updated by smaller primes
+            phi[i::i] = [value - value // i for value in phi[i::i]]
+    return phi
+
+
+SIEVE_LIMIT = 1 << 21  # TotientSum sieves at least that far - queries below are O(1) lookups
+
+
+class TotientSum:
+    """
+    Summatory totient function Phi(n) = phi(1) + phi(2) + ... + phi(n) in O(n ** (2/3)) (as core.TotientSum).
+    Uses identity: sum(Phi(n // d) for d in 1..n) = n * (n + 1) / 2
+    Values up to max(limit ** (2/3), min(limit, SIEVE_LIMIT)) are taken from sieved prefix sums,
+    so for limit <= SIEVE_LIMIT every query is a table lookup, bigger values n // d are memoized.
+    """
+
+    def __init__(self, limit):
+        self.small_limit = max(100, int(limit ** (2 / 3)), min(limit, SIEVE_LIMIT))
+        self.small = array('q', itertools.accumulate(phi_table(self.small_limit)))
+        self.cache = {}
+
+    def __call__(self, n):
+        if n <= self.small_limit:
+            return self.small[n]
+        if n in self.cache:
+            return self.cache[n]
+        root = math.isqrt(n)
+        small = self.small
+        result = n * (n + 1) // 2
+        # d <= sqrt(n): quotients n // d are big - one by one
+        result -= sum(self(n // d) for d in range(2, root + 1))
+        # d > sqrt(n): quotients q < sqrt(n) are small - d with n // d == q are grouped
+        result -= sum((n // q - max(n // (q + 1), root)) * small[q] for q in range(1, n // (root + 1) + 1))
+        self.cache[n] = result
+        return result
+
+
+def hacker_main():
+    """Read all queries at once and answer them from one TotientSum precomputation."""
+    data = sys.stdin.buffer.read().split()
+    queries = [int(n) for n in data[1:int(data[0]) + 1]]
+    totient_sum = TotientSum(max(queries, default=1))
+    # Fractions with denominator d are phi(d), phi(1) stands for 0/1 or 1/1 which is not proper fraction
+    sys.stdout.write('\n'.join(str(totient_sum(n) - 1) for n in queries) + '\n')
+
+
+if __name__ == "__main__":
+    hacker_main()
 
@@ -147,10 +147,105 @@ def count_rationals_semi_recursive(a, d):
 
 
 
-a, d = map(int, input().split())
+def floor_sum(n, m, a, b):
+    """Return sum(floor((a * i + b) / m) for i in range(n)) for a, b >= 0, m > 0 in O(log m) (as core.floor_sum)."""
+    result = 0
+    while True:
+        if a >= m:
+            result += n * (n - 1) // 2 * (a // m)
+            a %= m
+        if b >= m:
+            result += n * (b // m)
+            b %= m
+        y_max = a * n + b
+        if y_max < m:
+            return result
+        n, b = divmod(y_max, m)
+        m, a = a, m
+
+
+def mobius_table(n):
+    """Moebius function for 0..n."""
+    mu = [1] * (n + 1)
+    mu[0] = 0
+    is_prime = bytearray([1]) * (n + 1)
+    for prime in range(2, n + 1):
+        if is_prime[prime]:
+            is_prime[prime::prime] = bytes(len(range(prime, n + 1, prime)))
+            mu[prime::prime] = [-value for value in mu[prime::prime]]
+            square = prime * prime
+            mu[square::square] = [0] * len(range(square, n + 1, square))
+    return mu
+
+
+class Mertens:
+    """
+    Mertens function M(n) = mu(1) + ... + mu(n) in O(n ** (2/3)) using sum(M(n // d) for d in 1..n) == 1
+    (as core.Mertens). Small values are sieved, big values are memoized.
+    """
+
+    def __init__(self, limit):
+        self.small_limit = max(100, int(limit ** (2 / 3)))
+        self.small = list(itertools.accumulate(mobius_table(self.small_limit)))
+        self.cache = {}
+
+    def __call__(self, n):
+        if n <= self.small_limit:
+            return self.small[n]
+        if n in self.cache:
+            return self.cache[n]
+        root = math.isqrt(n)
+        small = self.small
+        result = 1
+        result -= sum(self(n // d) for d in range(2, root + 1))
+        result -= sum((n // q - max(n // (q + 1), root)) * small[q] for q in range(1, n // (root + 1) + 1))
+        self.cache[n] = result
+        return result
 
-# for a in range(2, 10):
-#     for d in range(2 * a + 1, 5 * a):
-#         print(a, d, count_rationals_simple(a, d), count_rationals(a, d))
 
-print(count_rationals(a, d))
+def count_fractions_between(p1, q1, p2, q2, max_d):
+    """
+    Count reduced fractions x / y with y <= max_d lying strictly between p1 / q1 and p2 / q2 (as core).
+    All pairs (x, y) in interval are counted by floor sums: A(n) = sum(floor((p2 * y - 1) / q2) - floor(p1 * y / q1)),
+    reduced fractions follow from Moebius inversion: R(n) = sum(mu(k) * A(n // k)),
+    k with the same n // k are grouped using Mertens function - O(max_d ** (2/3)) operations.
+    """
+    def pairs(n):
+        return floor_sum(n, q2, p2, p2 - 1) - floor_sum(n, q1, p1, p1)
+
+    mertens = Mertens(max_d)
+    result = 0
+    k = 1
+    while k <= max_d:
+        quotient = max_d // k
+        k_next = max_d // quotient + 1
+        result += (mertens(k_next - 1) - mertens(k - 1)) * pairs(quotient)
+        k = k_next
+    return result
+
+
+def farey_fractions_between(p1, q1, p2, q2, max_d):
+    """
+    Stream reduced fractions x / y with y <= max_d lying strictly between p1 / q1 and p2 / q2 in increasing order.
+    Reduced p1 / q1 must belong to Farey sequence of order max_d.
+    """
+    divisor = math.gcd(p1, q1)
+    a, b = p1 // divisor, q1 // divisor
+    # right neighbour of a / b: c * b - a * d == 1 with the biggest d <= max_d
+    d = max_d - (max_d + pow(a, -1, b)) % b if b > 1 else max_d
+    c = (1 + a * d) // b
+    while c * q2 < p2 * d:
+        yield c, d
+        k = (max_d + b) // d
+        a, b, c, d = c, d, k * c - a, k * d - b
+
+
+if __name__ == "__main__":
+    a, d = map(int, input().split())
+
+    # for a in range(2, 10):
+    #     for d in range(2 * a + 1, 5 * a):
+    #         print(a, d, count_rationals_simple(a, d), count_rationals(a, d),
+    #               count_fractions_between(1, a + 1, 1, a, d))
+
+    print(count_fractions_between(1, a + 1, 1, a, d))
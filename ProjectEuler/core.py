@@ -1,15 +1,20 @@
 """
 Gems or core functionalities used in different problems.
 """
+import heapq
 import itertools
-import random
-from bisect import bisect_left
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
 from collections import Counter
-from functools import reduce
+from functools import lru_cache, reduce
 from itertools import starmap
 import math
 from operator import mul
-from typing import Iterator, Sequence, TypeVar, Callable, Iterable, Tuple, List
+from typing import Iterator, Sequence, TypeVar, Callable, Iterable, Tuple, List, Dict
 
 GenT = TypeVar('GenT')
 
@@ -57,13 +62,118 @@ def fibonacci() -> Iterator[int]:
         f_current, f_next = f_next, f_current + f_next
 
 
+def fib_pair(n: int, *, mod: int = None) -> Tuple[int, int]:
+    """
+    Compute (F(n), F(n + 1)) by fast doubling in O(log n) multiplications:
+    F(2k) = F(k) * (2 * F(k + 1) - F(k)), F(2k + 1) = F(k) ** 2 + F(k + 1) ** 2.
+    :param mod: optional modulus, both numbers are reduced modulo mod
+    """
+    assert n >= 0
+    f_current, f_next = 0, 1
+    for bit in bin(n)[2:]:
+        f_double = f_current * (2 * f_next - f_current)
+        f_double_next = f_current * f_current + f_next * f_next
+        if mod:
+            f_double, f_double_next = f_double % mod, f_double_next % mod
+        if bit == '1':
+            f_current, f_next = f_double_next, f_double + f_double_next
+            if mod:
+                f_next %= mod
+        else:
+            f_current, f_next = f_double, f_double_next
+    if mod:
+        return f_current % mod, f_next % mod
+    return f_current, f_next
+
+
+def fib(n: int) -> int:
+    """Return n-th Fibonacci number, fib(0) == 0, fib(1) == 1."""
+    return fib_pair(n)[0]
+
+
+def fib_mod(n: int, m: int) -> int:
+    """Return F(n) mod m."""
+    return fib_pair(n, mod=m)[0]
+
+
+def even_fibonacci_sum(limit: int, *, mod: int = None) -> int:
+    """
+    Sum of even Fibonacci numbers not exceeding limit.
+    Even Fibonacci numbers are E(k) == F(3 * k) and E(k) == 4 * E(k - 1) + E(k - 2), their sum is
+    E(1) + ... + E(k) == (E(k + 1) + E(k) - 2) / 4.
+    Cutoff k comes from estimate F(n) ~ PHI ** n / sqrt(5) corrected by exact check of F(3 * k) <= limit,
+    then E(k), E(k + 1) are computed by fast doubling.
+    :param mod: optional modulus, E(k), E(k + 1) are computed modulo 4 * mod, only the cutoff check uses exact F(3 * k)
+    """
+    if limit < 2:
+        return 0
+    log_phi = math.log((1 + math.sqrt(5)) / 2)
+    k = int((math.log(limit) + math.log(5) / 2) / (3 * log_phi))
+    while fib(3 * k) > limit:
+        k -= 1
+    while fib(3 * k + 3) <= limit:
+        k += 1
+    modulus = 4 * mod if mod else None
+    e_current, e_next = fib_pair(3 * k, mod=modulus)[0], fib_pair(3 * k + 3, mod=modulus)[0]
+    if mod:
+        return (e_next + e_current - 2) % modulus // 4
+    return (e_next + e_current - 2) // 4
+
+
+def pisano_period(m: int) -> int:
+    """
+    Period of Fibonacci sequence modulo m.
+    pi(m) is lcm of pi(p ** k) == p ** (k - 1) * pi(p) over prime powers of m,
+    pi(p) divides p - 1 for p == +-1 (mod 5) and 2 * (p + 1) for p == +-2 (mod 5), pi(2) == 3, pi(5) == 20.
+    The smallest divisor of this bound with (F(d), F(d + 1)) == (0, 1) (mod p) is found by removing prime factors.
+    """
+    assert m > 0
+    if m == 1:
+        return 1
+    period = 1
+    for p, power in prime_factors_with_powers(m):
+        if p == 2:
+            p_period = 3
+        elif p == 5:
+            p_period = 20
+        else:
+            p_period = p - 1 if p % 5 in (1, 4) else 2 * (p + 1)
+            for q, _ in prime_factors_with_powers(p_period):
+                while p_period % q == 0 and fib_pair(p_period // q, mod=p) == (0, 1):
+                    p_period //= q
+        period = math.lcm(period, p_period * p ** (power - 1))
+    return period
+
+
+def fib_index_with_digits(d: int) -> int:
+    """
+    Index of the first Fibonacci number with d digits.
+    Binet's formula F(n) ~ PHI ** n / sqrt(5) gives the estimate n ~ ((d - 1) * log(10) + log(5) / 2) / log(PHI),
+    it is corrected by exact check of F(n - 1) < 10 ** (d - 1) <= F(n).
+    """
+    assert d > 0
+    if d == 1:
+        return 1
+    bound = 10 ** (d - 1)
+    n = math.ceil(((d - 1) * math.log(10) + math.log(5) / 2) / math.log((1 + math.sqrt(5)) / 2))
+    f_previous, f_current = fib_pair(n - 1)
+    while f_current < bound:
+        f_previous, f_current = f_current, f_previous + f_current
+        n += 1
+    while f_previous >= bound:
+        f_previous, f_current = f_current - f_previous, f_previous
+        n -= 1
+    return n
+
+
 def multiples_of(numbers: List[int]):
     """
     Calculate the number of numbers multiples in the range being their product.
     Eg for 3, 5 compute amount of 3 & 5 multiples in frame size 3 * 5
     """
     frame_size = reduce(mul, numbers)
-    multiples = sum(any(i % num == 0 for num in numbers) for i in range(frame_size))
+    # 0 is multiple of all numbers, the rest is counted by inclusion-exclusion
+    multiples = 1 + count_divisible_in_range(numbers, frame_size)
     return multiples, frame_size, multiples / frame_size
 
 
@@ -74,9 +184,9 @@ def divisors(num: int, *, start: int = 2, ordered: bool = False, step: int = 1)
         divisors = (i for i in range(start, n) if n % mod i == 0).
     :param step: step for verifying sequence of divisors (1= all numbers, 2 - odd numbers)
     :param num: number for which we yields divisors
-    :param ordered: if True divisors yields in increasing order
-        using list keeping half of the divisors.
-        For ordered=True risk of memory overflow for huge numbers with few thousands digits
+    :param ordered: if True divisors yields in increasing order.
+        For start 1 or 2 and step 1 divisors are generated from factorization (see divisors_of),
+        otherwise using list keeping half of the divisors.
     :param start: starting number for divisor.
         Most frequent use:
             start=2 yields all divisors excluding 1 and n -  it will contains nothing for prime num
@@ -147,37 +257,91 @@ def divisors(num: int, *, start: int = 2, ordered: bool = False, step: int = 1)
     else:
         no_int_sqrt = 1
 
-    if ordered:
+    if ordered and step == 1 and start <= 2:
+        # Ordered divisors are generated from factorization (heap merge) instead of the stack
+        for divisor in divisors_of(num, ordered=True):
+            if start == 1 or 1 < divisor < num:
+                yield divisor
+    elif ordered:
         yield from _sorted(_divisors())
     else:
         yield from _divisors()
 
 
-def prime_divisors(num: int) -> Iterator[int]:
+def divisors_of(num: int, *, ordered: bool = False, predicate: Callable[[int], bool] = None,
+                spf: 'SpfTable' = None) -> Iterator[int]:
     """
-    Get all num prime divisors.
+    Get all num divisors (including 1 and num) generated as products of prime powers of num factorization.
+    Divisors are produced lazily - the list of divisors is never materialized.
+    :param num: number for which we yields divisors
+    :param ordered: if True divisors yields in increasing order using heap merge.
+        Divisor p0**a0 * ... * pi**ai is pushed to the heap only by its parent p0**a0 * ... * pi**(ai-1),
+        so every divisor is generated once and heap contains O(number of primes * divisors yielded) items.
+    :param predicate: if given yields only divisors for which predicate is True
+    :param spf: optional smallest prime factor table used for num factorization
+    :yields: num divisors
+    """
+    assert num > 0, "divisors iterator works with num > 0"
+    factors = [] if num == 1 else prime_factors_with_powers(num, spf=spf)
+
+    def _unordered() -> Iterator[int]:
+        powers = [[prime ** power for power in range(counter + 1)] for prime, counter in factors]
+        for prime_powers in itertools.product(*powers):
+            yield math.prod(prime_powers)
+
+    def _ordered() -> Iterator[int]:
+        # heap items: (divisor, index of the last prime, its power)
+        heap = [(1, -1, 0)]
+        while heap:
+            divisor, index, power = heapq.heappop(heap)
+            yield divisor
+            if index >= 0 and power < factors[index][1]:
+                heapq.heappush(heap, (divisor * factors[index][0], index, power + 1))
+            for next_index in range(index + 1, len(factors)):
+                heapq.heappush(heap, (divisor * factors[next_index][0], next_index, 1))
+
+    iterator = _ordered() if ordered else _unordered()
+    if predicate is None:
+        yield from iterator
+    else:
+        yield from filter(predicate, iterator)
+
+
+def divisor_count(num: int, *, spf: 'SpfTable' = None) -> int:
+    """Return number of num divisors (tau) computed from factorization: product of (power + 1)."""
+    return divisor_sum(num, power=0, spf=spf)
+
+
+def divisor_sum(num: int, *, power: int = 1, spf: 'SpfTable' = None) -> int:
+    """
+    Return sum of power-th powers of num divisors (sigma_power) computed from factorization.
+    divisor_sum(n) - n is sum of proper divisors.
+    """
+    assert num > 0
+    if num == 1:
+        return 1
+    prime_power_sum = _sigma_prime_power(power)
+    return math.prod(prime_power_sum(prime, counter) for prime, counter in prime_factors_with_powers(num, spf=spf))
+
+
+def prime_divisors(num: int, *, spf: 'SpfTable' = None) -> Iterator[int]:
+    """
+    Get all num prime divisors in increasing order.
+    Uses trial division by small primes, Miller-Rabin test and Pollard rho for big cofactors.
     :param num: number for which we yields prime divisors
+    :param spf: optional smallest prime factor table - used for O(log n) lookups when num is in its range
     :yields: num prime divisors
     """
     assert num > 0
 
+    if spf is not None and num <= spf.limit:
+        yield from spf.prime_divisors(num)
+        return
+
     if num == 1:
         yield 1
 
-    while num % 2 == 0:
-        yield 2
-        num >>= 1
-    # start scan with 3 and step = 2
-    scan_start: int = 3
-    while num > 1:
-        try:
-            # try to get first prospect prime
-            scan_start = next(divisors(num, start=scan_start, step=2))
-        except StopIteration:
-            # if no divisors, means num is prime
-            scan_start = num
-        yield scan_start
-        num //= scan_start
+    yield from _factorize(num)
 
 
 def prime_divisors_using_prime(num: int, primes: list[int]) -> Iterator[int]:
@@ -212,19 +376,103 @@ def least_common_multiple(seq: Iterable[int]) -> int:
     :param seq: sequence of numbers
     :return: LCM
     """
+    return math.lcm(*seq)
+
+
+def _prime_powers(n: int) -> List[Tuple[int, int]]:
+    """Return sorted list of (p ** k, p) for all prime powers p ** k <= n."""
+    result = []
+    for prime in eratosthenes_sieve(n):
+        power = prime
+        while power <= n:
+            result.append((power, prime))
+            power *= prime
+    result.sort()
+    return result
+
+
+def lcm_upto(n: int, *, mod: int = None) -> int:
+    """
+    Least common multiple of 1..n as product of p ** floor(log_p(n)) over primes p <= n.
+    :param mod: optional modulus, with mod the multi-thousand-digit lcm is never built
+    """
+    result = 1
+    for prime in eratosthenes_sieve(n):
+        power = prime
+        while power * prime <= n:
+            power *= prime
+        result = result * power % mod if mod else result * power
+    return result % mod if mod else result
 
-    def lcm(num1: int, num2: int) -> int:
-        return num1 * num2 // math.gcd(num1, num2)
 
-    return reduce(lcm, seq, 1)
+class LcmTable:
+    """
+    Prefix table lcm(1..n) for all n <= limit.
+    lcm(1..n) changes only at prime powers: lcm(1..p ** k) == lcm(1..p ** k - 1) * p,
+    so one value is kept per prime power and index[n] points to the last prime power <= n - O(1) query.
+    Exact values have thousands of digits for big limit, use mod then.
+    """
+
+    def __init__(self, limit: int, *, mod: int = None):
+        self.limit = limit
+        self.mod = mod
+        # lcm(1..0) == lcm(1..1) == values[0]
+        self.index = array('I', [0, 0])[:limit + 1]
+        self.values = [1]
+        value = 1
+        prime_powers = _prime_powers(limit)
+        for i, (power, prime) in enumerate(prime_powers, 1):
+            value = value * prime % mod if mod else value * prime
+            self.values.append(value)
+            end = prime_powers[i][0] if i < len(prime_powers) else limit + 1
+            self.index.extend(array('I', [i]) * (end - power))
+
+    def __getitem__(self, n: int) -> int:
+        """Return lcm(1..n) (modulo mod)."""
+        return self.values[self.index[n]]
+
+
+def count_distinct_powers(n: int) -> int:
+    """
+    Count distinct a ** b for 2 <= a, b <= n.
+    Bases are grouped by their perfect power root r (r is not perfect power itself): r, r ** 2, ..., r ** k <= n.
+    (r ** i) ** b == r ** (i * b) so the root contributes distinct products i * b for 1 <= i <= k, 2 <= b <= n,
+    the count depends only on level k. Counts for all levels are collected once, level by level, in a bitset of products.
+    O(n * log n) operations done mostly by bytearray slices.
+    """
+    if n < 2:
+        return 0
+    # levels[r] == k for perfect power root r <= sqrt(n), perfect powers are marked with 0
+    root = math.isqrt(n)
+    is_power = bytearray(n + 1)
+    levels = Counter()
+    for r in range(2, root + 1):
+        if not is_power[r]:
+            k, power = 1, r * r
+            while power <= n:
+                is_power[power] = 1
+                k, power = k + 1, power * r
+            levels[k] += 1
+    # roots bigger than sqrt(n) are on level 1
+    levels[1] += n - root - is_power.count(1, root + 1)
+    # products[k] - amount of distinct i * b for 1 <= i <= k, 2 <= b <= n
+    max_level = max(levels)
+    seen = bytearray(max_level * n + 1)
+    products = [0] * (max_level + 1)
+    ones = b'\x01' * (n - 1)
+    for i in range(1, max_level + 1):
+        level_slice = slice(2 * i, i * n + 1, i)
+        products[i] = products[i - 1] + n - 1 - seen[level_slice].count(1)
+        seen[level_slice] = ones
+    return sum(products[k] * count for k, count in levels.items())
 
 
 IntPair = Tuple[int, int]
 
 
-def prime_factors_with_powers(num: int) -> List[IntPair]:
+def prime_factors_with_powers(num: int, *, spf: 'SpfTable' = None) -> List[IntPair]:
     """Return prime divisors of num as tuples (prime, counter)."""
-    primes = Counter(prime_divisors(num))
+    primes = Counter(prime_divisors(num, spf=spf))
     result = []
     for prime, power in sorted(primes.items()):
         result.append((prime, power))
@@ -234,7 +482,7 @@ def prime_factors_with_powers(num: int) -> List[IntPair]:
     return result
 
 
-def normalized_prime_factors_with_powers(num: int) -> Tuple[int, List[IntPair]]:
+def normalized_prime_factors_with_powers(num: int, *, spf: 'SpfTable' = None) -> Tuple[int, List[IntPair]]:
     """Return prime divisors of num as tuples (prime, power) with common power for all.
     normalized_prime_divisors_with_powers(6) = [1, [(2,1), (3, 1)]
     normalized_prime_divisors_with_powers(12) = [1, [(2,2), (3, 1)]
@@ -242,103 +490,126 @@ def normalized_prime_factors_with_powers(num: int) -> Tuple[int, List[IntPair]]:
     normalized_prime_divisors_with_powers(36) = [2, [(2,1), (3, 1)]
     normalized_prime_divisors_with_powers(64) = [6, [(2,1)]
     """
-    prime_tuples = prime_factors_with_powers(num)
+    prime_tuples = prime_factors_with_powers(num, spf=spf)
     gcd = math.gcd(*[p[1] for p in prime_tuples])
     prime_tuples = [(p[0], p[1] // gcd) for p in prime_tuples]
     return gcd, prime_tuples
 
 
+IS_PRIME_SIEVE_LIMIT = 1 << 20  # numbers up to limit are verified by PrimeSet bitmap lookup
+IS_PRIME_TRIAL_CUTOFF = 1000  # the biggest divisor verified by mod 30 wheel trial division
+_is_prime_set: 'PrimeSet' = None
+
+
+def _shared_prime_set() -> 'PrimeSet':
+    """Return PrimeSet up to IS_PRIME_SIEVE_LIMIT shared by is_prime and nth_prime - built at the first use."""
+    global _is_prime_set
+    if _is_prime_set is None:
+        _is_prime_set = PrimeSet(IS_PRIME_SIEVE_LIMIT)
+    return _is_prime_set
+
+
 def is_prime(num: int, *, primes: List[int] = None) -> bool:
     """
     Verify if num is prime
+    Tiered engine: primes table, sieve bitmap, mod 30 wheel trial division and deterministic Miller-Rabin
+    (see is_prime_tier).
     :param num:
     :param primes: initial sorted primes table if exist (e.g. from Eratosthenes)
     :return: True if prime, False otherwise
     """
-    if num < 2:
-        return False
-    if num < 13:
-        #       2,    3,    4,     5,    6,     7,    8,     9,     10,    11,   12
-        return [True, True, False, True, False, True, False, False, False, True, False][num-2]
-    if num % 2 == 0 or num % 3 == 0:
-        return False
+    return is_prime_tier(num, primes=primes)[0]
 
-    sqrt_num = int(math.sqrt(num))
-    start = 13
+
+def is_prime_tier(num: int, *, primes: List[int] = None) -> Tuple[bool, str]:
+    """
+    Verify if num is prime and report which tier answered - for profiling.
+    Tiers:
+        'table' - num in range of primes table (bisect) or table primes cover sqrt(num)
+        'sieve' - O(1) bitmap lookup for num <= IS_PRIME_SIEVE_LIMIT (bitmap is built at the first use)
+        'trial' - mod 30 wheel trial division with divisors up to IS_PRIME_TRIAL_CUTOFF
+        'miller-rabin' - deterministic Miller-Rabin (Baillie-PSW above 2 ** 64)
+    :param num:
+    :param primes: initial sorted primes table if exist (e.g. from Eratosthenes)
+    :return: (True if prime, False otherwise), tier name
+    """
+    if num < 2:
+        return False, 'trial'
 
     if primes:
         if num <= primes[-1]:
-            return primes[bisect_left(primes, num)] == num
+            return primes[bisect_left(primes, num)] == num, 'table'
+        sqrt_num = math.isqrt(num)
         for prime in primes:
             if prime > sqrt_num:
-                break
+                return True, 'table'
             if num % prime == 0:
-                return False
-        if primes[-1] % 6 == 1:
-            start = primes[-1]
-        else:
-            start = primes[-1] + 2
-
-    for n in range(start, 6, sqrt_num + 1):
-        if num % n == 0 or num % (n + 4) == 0:
-            return False
-    return True
-
-
-def is_prime_Miller_Rabin(num: int, *, primes: List[int] = None, tests: int = 5) -> bool:
+                return False, 'table'
+
+    if num <= IS_PRIME_SIEVE_LIMIT:
+        return num in _shared_prime_set(), 'sieve'
+
+    if num % 2 == 0 or num % 3 == 0 or num % 5 == 0:
+        return False, 'trial'
+    sqrt_num = math.isqrt(num)
+    divisor_limit = min(sqrt_num, IS_PRIME_TRIAL_CUTOFF)
+    divisor, index = 7, 0
+    while divisor <= divisor_limit:
+        if num % divisor == 0:
+            return False, 'trial'
+        divisor += WHEEL_30_GAPS[index]
+        index = (index + 1) % 8
+    if sqrt_num <= IS_PRIME_TRIAL_CUTOFF:
+        # all divisors up to sqrt(num) verified
+        return True, 'trial'
+    return _is_probable_prime(num), 'miller-rabin'
+
+
+def is_prime_Miller_Rabin(num: int, *, primes: List[int] = None) -> bool:
     """
-    Verify if num is prime
+    Verify if num is prime using deterministic Miller-Rabin test.
+    For num < 2 ** 64 the minimal known witness sets are used, above 2 ** 64 it is Baillie-PSW test.
     :param num:
     :param primes: initial sorted primes table if exist (e.g. from Eratosthenes) - recommend up to the first 20 primes
-    :param tests: number of additional rounds for big number testing
+        used for trial division before the test, without it small primes are filtered out by single gcd
     :return: True if prime, False otherwise
     """
+    if not primes:
+        return _is_prime_gcd_filtered(num)
     if num < 2:
         return False
     if num < 13:
         #       2,    3,    4,     5,    6,     7,    8,     9,     10,    11,   12
         return [True, True, False, True, False, True, False, False, False, True, False][num-2]
 
-    sqrt_num = int(math.sqrt(num))
+    sqrt_num = math.isqrt(num)
     for prime in primes:
         if prime > sqrt_num:
             return True
         if num % prime == 0:
             return False
+    if num % 2 == 0:
+        return False
+    return _is_probable_prime(num)
 
-    # Factor n-1 as d * 2 ** s
-    s, d = 0, num - 1
-    while d % 2 == 0:
-        d //= 2
-        s += 1
-
-    # Make witnesses
-    if num < 1373653:
-        test_set = [2, 3]
-    elif num < 25326001:
-        test_set = [2, 3, 5]
-    elif num < 118670087467:
-        if num == 3215031751:
-            return False
-        test_set = [2, 3, 5, 7]
-    elif num < 2152302898747:
-        test_set = [2, 3, 5, 7, 11]
-    else:
-        test_set = [2, 3, 5, 7, 11, 13] + [random.randrange(17, num - 1) for _ in range(tests)]
-    for a in test_set:
-        x = pow(a, d, num)
-        if x in [1, num - 1]:
-            continue
-        for _ in range(s):
-            x = x * x % num
-            if x == num - 1:
-                break
-        else:
-            return False
-    return True
 
+def are_prime(nums: Iterable[int]) -> List[bool]:
+    """
+    Batched deterministic primality test.
+    Numbers below the batch sieve limit (64 per number in batch, at most IS_PRIME_SIEVE_LIMIT) are looked up
+    in one odd-only sieve shared by the whole batch, bigger ones go through gcd prefilter and Miller-Rabin.
+    :param nums: numbers to verify
+    :return: list of flags - True for prime numbers
+    """
+    nums = list(nums)
+    sieve_limit = min(IS_PRIME_SIEVE_LIMIT, 64 * len(nums))
+    top = max((num for num in nums if num <= sieve_limit), default=0)
+    flags = _odd_sieve(top)
+    return [(num == 2 or num & 1 == 1 and flags[num >> 1] == 1) if 0 <= num <= top else _is_prime_gcd_filtered(num)
+            for num in nums]
 
-def partitions(n) -> Iterator[List[int]]:
+
+def partitions(n, *, copy: bool = True) -> Iterator[List[int]]:
     """
     Yields number n partitions.
     partitions(5) yields:
@@ -349,6 +620,8 @@ def partitions(n) -> Iterator[List[int]]:
         [1, 2, 2]
         [1, 1, 1, 2]
         [1, 1, 1, 1, 1]
+    :param copy: yield new list for every partition, with copy=False the in-place buffer itself is yielded,
+        it must not be modified and is valid only until the next partition is requested
     """
 
     def next_partition() -> bool:
@@ -393,54 +666,173 @@ def partitions(n) -> Iterator[List[int]]:
     for m in range(n):
         partition = [1] * m
         partition.append(n - m)
-        yield partition[:]
+        yield partition[:] if copy else partition
         # Next partitions with the same size
         while next_partition():
             # assert all(a <= b for a, b in zip(partition, partition[1:])), partition
             # assert sum(partition) == n, partition
-            yield partition[:]
+            yield partition[:] if copy else partition
 
 
-def eratosthenes_sieve_it() -> Iterator[int]:
-    # http://mypy-lang.org/examples.html example
-    # An iterator of all prime numbers between 2 and
-    # +infinity
-    numbers = itertools.count(2)
+def _partition_numbers(n: int, mod: int = None) -> List[int]:
+    """
+    Partition numbers p(0), ..., p(n) from Euler's pentagonal number theorem in O(n ** 1.5):
+    p(k) = sum((-1) ** (j + 1) * (p(k - j * (3 * j - 1) // 2) + p(k - j * (3 * j + 1) // 2)) for j >= 1).
+    """
+    # Generalized pentagonal numbers 1, 2, 5, 7, 12, 15, ... with their signs
+    pentagonal = []
+    j = 1
+    while j * (3 * j - 1) // 2 <= n:
+        sign = 1 if j % 2 else -1
+        pentagonal.append((j * (3 * j - 1) // 2, sign))
+        pentagonal.append((j * (3 * j + 1) // 2, sign))
+        j += 1
+    p = [1] + [0] * n
+    for k in range(1, n + 1):
+        total = 0
+        for offset, sign in pentagonal:
+            if offset > k:
+                break
+            total += sign * p[k - offset]
+        p[k] = total % mod if mod else total
+    return p
 
-    # Generate primes forever
+
+def partition_count(n: int, *, mod: int = None, parts: Iterable[int] = None, max_parts: int = None) -> int:
+    """
+    Count partitions of n without generating them.
+    Unrestricted count uses pentagonal number recurrence in O(n ** 1.5).
+    Partitions into given parts are counted by coin change dynamic programming in O(n * len(parts)),
+    partitions into at most max_parts parts are partitions into parts <= max_parts (conjugate partitions),
+    both restrictions together need counts per number of parts: O(n * len(parts) * max_parts).
+    :param mod: optional modulus for the result
+    :param parts: allowed parts
+    :param max_parts: the biggest number of parts
+    :return: number of partitions (modulo mod)
+    """
+    if n < 0:
+        return 0
+    if parts is None and max_parts is None:
+        return _partition_numbers(n, mod)[n]
+    if parts is None:
+        parts, max_parts = range(1, max_parts + 1), None
+    parts = sorted({part for part in parts if 0 < part <= n})
+    if max_parts is None:
+        ways = [1] + [0] * n
+        for part in parts:
+            for total in range(part, n + 1):
+                ways[total] += ways[total - part]
+                if mod:
+                    ways[total] %= mod
+        return ways[n] % mod if mod else ways[n]
+    # ways[count][total] - partitions of total into count allowed parts
+    ways = [[1] + [0] * n] + [[0] * (n + 1) for _ in range(max_parts)]
+    for part in parts:
+        for count in range(1, max_parts + 1):
+            current, previous = ways[count], ways[count - 1]
+            for total in range(part, n + 1):
+                current[total] += previous[total - part]
+                if mod:
+                    current[total] %= mod
+    result = sum(row[n] for row in ways)
+    return result % mod if mod else result
+
+
+# Mod 30 wheel: gaps between consecutive numbers co-prime to 30 starting from 7 (7, 11, 13, ..., 29, 31, 37)
+WHEEL_30_GAPS = (4, 2, 4, 2, 4, 6, 2, 6)
+
+
+def eratosthenes_sieve_it(start: int = 2) -> Iterator[int]:
+    """
+    Unbounded Eratosthenes sieve streaming primes from segmented odd-only sieve windows.
+    Every window is twice as long as the numbers before it, so base primes are sieved O(log n) times,
+    and primes are delivered block by block from sieve_segments - memory is O(sqrt(n) + SIEVE_SEGMENT_SIZE).
+    :param start: yields primes >= start - the stream starts without sieving from 2
+    :yields: primes in increasing order
+    """
+    low = max(start, 2)
     while True:
-        # Get the first number from the iterator
-        # (always a prime)
-        prime = next(numbers)
-        yield prime
+        high = max(2 * low, low + 2 * SIEVE_SEGMENT_SIZE)
+        for block in sieve_segments(high, start=low):
+            yield from block
+        low = high + 1
 
-        # This code iteratively builds up a chain
-        # of filters...
-        numbers = filter(prime.__rmod__, numbers)
+
+def inclusion_exclusion_terms(divisors: Iterable[int], limit: int) -> List[IntPair]:
+    """
+    Build inclusion-exclusion terms (lcm, sign) for numbers divisible by any of the divisors.
+    Amount of numbers in 1..n (n <= limit) divisible by any divisor is sum(sign * (n // lcm)).
+    Divisors being multiples of other divisors are removed and subsets with lcm > limit are pruned
+    (together with all their supersets), so there is at most 2 ** len(divisors) terms.
+    :param divisors: positive divisors
+    :param limit: the biggest number which will be verified
+    :return: list of (lcm of the subset, +1 for odd subset size or -1 for even)
+    """
+    reduced: List[int] = []
+    for divisor in sorted(set(divisors)):
+        if divisor <= limit and all(divisor % smaller for smaller in reduced):
+            reduced.append(divisor)
+    terms: List[IntPair] = []
+    # stack of (index of the next divisor, lcm of subset, sign of the next subset)
+    stack = [(0, 1, 1)]
+    while stack:
+        start, lcm, sign = stack.pop()
+        for index in range(start, len(reduced)):
+            divisor = reduced[index]
+            new_lcm = lcm // math.gcd(lcm, divisor) * divisor
+            if new_lcm <= limit:
+                terms.append((new_lcm, sign))
+                stack.append((index + 1, new_lcm, -sign))
+    return terms
+
+
+def count_and_sum_divisible_in_range(divisors: Iterable[int], stop: int) -> IntPair:
+    """
+    Compute amount and sum of numbers in range(1, stop) which are divisible by any of the divisors.
+    Uses inclusion-exclusion over divisors subsets - O(2 ** len(divisors)) instead of O(lcm(divisors)).
+    """
+    last = stop - 1
+    count = total = 0
+    for lcm, sign in inclusion_exclusion_terms(divisors, last):
+        multiples = last // lcm
+        count += sign * multiples
+        total += sign * lcm * multiples * (multiples + 1) // 2
+    return count, total
 
 
 def count_divisible_in_range(divisors: Iterable[int], stop: int):
     """Compute amount of numbers in range(1, stop) which are divisible by any of the divisors."""
+    return count_and_sum_divisible_in_range(divisors, stop)[0]
 
-    def has_divisors_in_list(num: int):
-        for d in divisors_list:
-            if num % d == 0:
-                return True
-        return False
 
-    divisors_list = list(divisors)
-    cycle = least_common_multiple(divisors_list)
-    frames = (stop - 1) // cycle
-    # multiples for the first frame
-    multiples = [i for i in range(1, cycle + 1) if has_divisors_in_list(i)]
-    frame_sum = len(multiples)
-    # every next frame has the same amount of divisors
-    total = frames * len(multiples)
-    # add sum for ending part which is not full frame
-    for k in range(frames * cycle + 1, stop):
-        if has_divisors_in_list(k):
-            total += 1
-    return total
+def sum_divisible_in_range(divisors: Iterable[int], stop: int):
+    """Compute sum of numbers in range(1, stop) which are divisible by any of the divisors."""
+    return count_and_sum_divisible_in_range(divisors, stop)[1]
+
+
+class DivisibleSum:
+    """
+    Sum of numbers in range(1, stop) divisible by any of the divisors for many stop values.
+    Inclusion-exclusion terms are built once for the divisor set, every query costs
+    a few big-int multiplications per term: sum(sign * lcm * m * (m + 1) / 2) where m = (stop - 1) // lcm.
+    """
+
+    def __init__(self, divisors: Iterable[int], limit: int):
+        """
+        :param divisors: positive divisors
+        :param limit: the biggest stop which will be queried
+        """
+        self.limit = limit
+        self.terms = inclusion_exclusion_terms(divisors, limit - 1)
+
+    def __call__(self, stop: int) -> int:
+        assert stop <= self.limit
+        last = stop - 1
+        total = 0
+        for lcm, sign in self.terms:
+            multiples = last // lcm
+            total += sign * lcm * multiples * (multiples + 1)
+        return total // 2
 
 
 def gen_primes(n: int) -> List[int]:
@@ -459,54 +851,986 @@ def gen_primes(n: int) -> List[int]:
     return primes
 
 
-def eratosthenes_sieve(n):
-    """Return primes <= n."""
+SIEVE_SEGMENT_SIZE = 1 << 18  # odd numbers per sieve block - 256 KiB bytearray fits in L2 cache
 
-    def add_prime(k):
-        """Add founded prime."""
-        primes.append(k)
-        pos = k + k
-        while pos <= n:
-            numbers[pos] = 1
-            pos += k
 
-    numbers = [0] * (n + 1)
-    primes = [2]
-    for i in range(3, n + 1, 2):
-        if not numbers[i]:
-            add_prime(i)
+def _primes_typecode(n: int) -> str:
+    """Return the smallest array typecode able to keep primes <= n."""
+    return 'I' if n < 1 << 32 else 'Q'
+
+
+def _odd_sieve(n: int) -> bytearray:
+    """
+    Simple odd-only sieve.
+    :param n: sieve limit
+    :return: flags where flags[i] == 1 means that 2 * i + 1 is prime (i < (n + 1) // 2)
+    """
+    size = (n + 1) // 2
+    flags = bytearray([1]) * size
+    if size:
+        flags[0] = 0
+    for i in range(1, (math.isqrt(n) - 1) // 2 + 1):
+        if flags[i]:
+            prime = 2 * i + 1
+            start = prime * prime // 2
+            flags[start::prime] = bytes(len(range(start, size, prime)))
+    return flags
+
+
+def _sieve_flag_segments(stop: int, start: int, segment_size: int) -> Iterator[Tuple[int, bytearray]]:
+    """
+    Segmented, odd-only Eratosthenes sieve flags.
+    :yields: (low, segment) where segment[i] == 1 means that low + 2 * i is prime, low is odd and >= 3
+    """
+    # the first odd number in range
+    low = max(3, start | 1)
+    if low > stop:
+        return
+
+    # base primes (odd only) needed for crossing out composites up to stop
+    base_flags = _odd_sieve(math.isqrt(stop))
+    base_primes = list(itertools.compress(range(1, 2 * len(base_flags), 2), base_flags))
+    zeros = memoryview(bytes(segment_size))
+
+    while low <= stop:
+        high = min(low + 2 * (segment_size - 1), stop)
+        # segment[i] represents low + 2 * i
+        size = (high - low) // 2 + 1
+        segment = bytearray([1]) * size
+        for prime in base_primes:
+            square = prime * prime
+            if square > high:
+                break
+            if square >= low:
+                first = square
+            else:
+                first = low + (-low) % prime
+                if first % 2 == 0:
+                    first += prime
+            index = (first - low) // 2
+            if index < size:
+                segment[index::prime] = zeros[:len(range(index, size, prime))]
+        yield low, segment
+        low = high + 2
+
+
+def sieve_segments(stop: int, *, start: int = 2, segment_size: int = SIEVE_SEGMENT_SIZE) -> Iterator[array]:
+    """
+    Segmented, odd-only Eratosthenes sieve.
+    Only odd numbers are kept in the sieve and the range is processed in cache sized blocks,
+    so memory use is O(sqrt(stop) + segment_size) independently of the range size.
+    :param stop: the last number verified (inclusive)
+    :param start: the first number verified
+    :param segment_size: amount of odd numbers sieved in one block
+    :yields: arrays with primes from consecutive blocks in increasing order
+    """
+    typecode = _primes_typecode(stop)
+    if start <= 2 <= stop:
+        yield array(typecode, [2])
+    for low, segment in _sieve_flag_segments(stop, start, segment_size):
+        yield array(typecode, itertools.compress(range(low, low + 2 * len(segment), 2), segment))
+
+
+def eratosthenes_sieve(n: int, *, start: int = 2) -> array:
+    """
+    Return primes <= n (and >= start) as compact array of integers.
+    Uses segmented odd-only sieve, so it works in bounded memory for big n.
+    :param n: the last number verified
+    :param start: the first number verified
+    :return: array('I') of primes or array('Q') when n does not fit in 32 bits
+    """
+    primes = array(_primes_typecode(n))
+    for block in sieve_segments(n, start=start):
+        primes.extend(block)
     return primes
 
 
+PRIMES_CACHE_DIR = os.environ.get('PROJECT_EULER_CACHE',
+                                  os.path.join(os.path.expanduser('~'), '.cache', 'project_euler'))
+PRIMES_CACHE_VERSION = 1
+# Cache file header: magic, byte order, version, sieve limit, primes counter - padded to 32 bytes
+_PRIMES_CACHE_HEADER = struct.Struct('=7sBIQQ4x')
+_PRIMES_CACHE_MAGIC = b'PEPRIME'
+_primes_cache: Dict[str, Tuple[int, memoryview]] = {}
+
+
+def _primes_cache_path(cache_dir: str) -> str:
+    return os.path.join(cache_dir, f'primes-v{PRIMES_CACHE_VERSION}-{sys.byteorder}.bin')
+
+
+def _open_primes_cache(path: str) -> Tuple[int, memoryview]:
+    """Map primes cache file - return sieve limit and zero-copy view of primes (uint32)."""
+    with open(path, 'rb') as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(mapped) < _PRIMES_CACHE_HEADER.size:
+        raise ValueError(f"Truncated primes cache file {path}")
+    magic, byte_order, version, limit, counter = _PRIMES_CACHE_HEADER.unpack_from(mapped)
+    if (magic, byte_order, version) != (_PRIMES_CACHE_MAGIC, sys.byteorder == 'little', PRIMES_CACHE_VERSION):
+        raise ValueError(f"Incompatible primes cache file {path}")
+    if len(mapped) != _PRIMES_CACHE_HEADER.size + 4 * counter:
+        raise ValueError(f"Truncated primes cache file {path}")
+    return limit, memoryview(mapped)[_PRIMES_CACHE_HEADER.size:].cast('I')
+
+
+def _write_primes_cache(path: str, limit: int, old_limit: int, old_primes: Sequence[int]):
+    """Write primes <= limit into cache file (old primes are reused, only the new range is sieved)."""
+    primes = array('I', old_primes)
+    for block in sieve_segments(limit, start=old_limit + 1):
+        primes.extend(block)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    with open(temp_path, 'wb') as file:
+        file.write(_PRIMES_CACHE_HEADER.pack(_PRIMES_CACHE_MAGIC, sys.byteorder == 'little',
+                                             PRIMES_CACHE_VERSION, limit, len(primes)))
+        primes.tofile(file)
+    # Atomic replace - views mapped from the previous file stay valid
+    os.replace(temp_path, path)
+
+
+def cached_primes(n: int, *, cache_dir: str = None) -> memoryview:
+    """
+    Return primes <= n from persistent cache file as memory mapped (zero-copy) uint32 view.
+    The cache is built by the segmented sieve at the first use and extended on demand
+    (at least doubled) when a bigger limit is requested, so next processes only map the file.
+    :param n: the biggest prime required (n < 2 ** 32)
+    :param cache_dir: cache directory, default PRIMES_CACHE_DIR (env PROJECT_EULER_CACHE)
+    :return: memoryview with format 'I' supporting len, indexing, slicing and bisect
+    """
+    assert n < 1 << 32, "primes cache keeps 32 bits primes"
+    path = _primes_cache_path(cache_dir or PRIMES_CACHE_DIR)
+    if path not in _primes_cache and os.path.exists(path):
+        try:
+            _primes_cache[path] = _open_primes_cache(path)
+        except ValueError:
+            pass
+    limit, primes = _primes_cache.get(path, (1, memoryview(array('I'))))
+    if limit < n:
+        new_limit = min(max(n, 2 * limit), (1 << 32) - 1)
+        _write_primes_cache(path, new_limit, limit, primes)
+        _primes_cache[path] = limit, primes = _open_primes_cache(path)
+    return primes[:bisect_right(primes, n)]
+
+
+def _sigma_prime_power(k: int) -> Callable[[int, int], int]:
+    """Return sigma_k(p ** e) = 1 + p ** k + p ** 2k + ... + p ** ek."""
+    if k == 0:
+        return lambda prime, power: power + 1
+    return lambda prime, power: (prime ** (k * (power + 1)) - 1) // (prime ** k - 1)
+
+
+def _sigma_typecode(n: int, k: int) -> str:
+    """
+    Return array typecode able to keep sigma_k(m) for all m <= n, None when it does not fit in 64 bits.
+    sigma_k(m) = m ** k * sum of d ** -k over divisors d - bounded by harmonic sum (k == 1) or zeta(k) <= 2.
+    """
+    bound = n if k == 0 else n ** k * (n.bit_length() + 1 if k == 1 else 2)
+    return 'Q' if bound < 1 << 64 else None
+
+
+def linear_sieve(n: int, *, phi: bool = False, mu: bool = False, tau: bool = False, omega: bool = False,
+                 sigma: Iterable[int] = (), prime_power: Dict[str, Callable[[int, int], int]] = None
+                 ) -> Tuple[array, Dict[str, Sequence[int]]]:
+    """
+    Linear (Euler) sieve - compute primes <= n and requested arithmetic functions for 0..n in one O(n) pass.
+    Every composite m is generated exactly once as m = i * p, where p is the smallest prime of m.
+    Multiplicative function f is computed as f(m) = f(m // p**e) * f(p**e), where p**e is the smallest prime power
+    part of m, so the function needs only its value on prime powers.
+    :param n: the last number computed
+    :param phi: compute Euler totient function
+    :param mu: compute Moebius function
+    :param tau: compute number of divisors
+    :param omega: compute number of distinct prime divisors
+    :param sigma: powers k for computing sum of k-th powers of divisors - sigma=(1,) gives sum of divisors.
+        Values are kept in 'Q' array while their bound fits in 64 bits, in list of ints otherwise
+    :param prime_power: user defined multiplicative functions - name -> f(p, e) returning value for p**e.
+        Values are kept in signed 64-bit 'q' array, so f(m) for all m <= n must be in [-2 ** 63, 2 ** 63)
+    :return: primes and dictionary name -> array (or list for big sigma<k>) of function values for 0..n.
+        Names are: 'phi', 'mu', 'tau', 'omega', 'sigma<k>' and names from prime_power.
+    """
+    typecode = _primes_typecode(n)
+    # multiplicative functions as (name, typecode, value on prime power)
+    functions: List[Tuple[str, str, Callable[[int, int], int]]] = []
+    if phi:
+        functions.append(('phi', typecode, lambda prime, power: prime ** power - prime ** (power - 1)))
+    if mu:
+        functions.append(('mu', 'b', lambda prime, power: -1 if power == 1 else 0))
+    if tau:
+        functions.append(('tau', 'I', _sigma_prime_power(0)))
+    for k in sigma:
+        functions.append((f'sigma{k}', _sigma_typecode(n, k), _sigma_prime_power(k)))
+    for name, function in (prime_power or {}).items():
+        functions.append((name, 'q', function))
+
+    result: Dict[str, Sequence[int]] = {}
+    for name, code, _ in functions:
+        values = array(code, [1]) * (n + 1) if code else [1] * (n + 1)
+        values[0] = 0
+        result[name] = values
+    multiplicative = [(result[name], function) for name, _, function in functions]
+    omegas = None
+    if omega:
+        omegas = result['omega'] = array('B', [0]) * (n + 1)
+
+    # smallest prime, smallest prime power part and its exponent for every number
+    smallest = array(typecode, [0]) * (n + 1)
+    smallest_power = array(typecode, [0]) * (n + 1)
+    exponent = array('B', [0]) * (n + 1)
+    primes = array(typecode)
+
+    for i in range(2, n + 1):
+        if not smallest[i]:
+            smallest[i] = smallest_power[i] = i
+            exponent[i] = 1
+            primes.append(i)
+            for values, function in multiplicative:
+                values[i] = function(i, 1)
+            if omegas is not None:
+                omegas[i] = 1
+        smallest_i = smallest[i]
+        for prime in primes:
+            num = i * prime
+            if prime > smallest_i or num > n:
+                break
+            smallest[num] = prime
+            if prime < smallest_i:
+                # prime is new for num: f(num) = f(i) * f(prime)
+                smallest_power[num] = prime
+                exponent[num] = 1
+                for values, _ in multiplicative:
+                    values[num] = values[i] * values[prime]
+                if omegas is not None:
+                    omegas[num] = omegas[i] + 1
+            else:
+                # prime is already the smallest prime of i: extend its power part
+                power_part = smallest_power[num] = smallest_power[i] * prime
+                power = exponent[num] = exponent[i] + 1
+                rest = i // smallest_power[i]
+                if rest == 1:
+                    for values, function in multiplicative:
+                        values[num] = function(prime, power)
+                else:
+                    for values, _ in multiplicative:
+                        values[num] = values[rest] * values[power_part]
+                if omegas is not None:
+                    omegas[num] = omegas[i]
+    return primes, result
+
+
 def phi_sieve(n):
     """Return primes <= n and phi(n).
     phi(n) is Euler totient function, which return amount of integers less than n which are co-prime to n.
+    phi(0) and phi(1) are set to 0.
     """
+    primes, functions = linear_sieve(n, phi=True)
+    numbers = functions['phi']
+    if n >= 1:
+        numbers[1] = 0
+    return primes, numbers
+
+
+def _phi_table(n: int) -> List[int]:
+    """Euler totient for 0..n - for every prime p all multiples x are updated by slice: phi -= phi // p."""
+    phi = list(range(n + 1))
+    for prime in eratosthenes_sieve(n):
+        phi[prime::prime] = [value - value // prime for value in phi[prime::prime]]
+    return phi
+
 
-    def power_prime_phi(num, n):
-        result = n - 1
-        num = num // n
-        while num % n == 0:
-            result *= n
-            num = num // n
+SUMMATORY_SIEVE_LIMIT = 1 << 21  # summatory functions sieve at least that far - queries below are O(1) lookups
+
+
+class _DirichletSummatory:
+    """
+    Summatory function F(n) = f(1) + ... + f(n) of f such that sum(F(n // d) for d in 1..n) == total(n).
+    Values up to max(limit ** (2/3), min(limit, SUMMATORY_SIEVE_LIMIT)) are taken from sieved prefix sums,
+    so limit <= SUMMATORY_SIEVE_LIMIT means all queries are table lookups. Bigger values n // d are computed
+    by grouping d with the same quotient and memoized. Time and memory O(limit ** (2/3)).
+    """
+
+    def __init__(self, limit: int, table: Callable[[int], List[int]], total: Callable[[int], int]):
+        """
+        :param limit: the biggest n which will be queried
+        :param table: returns f(0), f(1), ..., f(n) with f(0) == 0
+        :param total: returns sum(F(n // d) for d in 1..n)
+        """
+        self.limit = limit
+        self.small_limit = max(100, int(limit ** (2 / 3)), min(limit, SUMMATORY_SIEVE_LIMIT))
+        self.small = array('q', itertools.accumulate(table(self.small_limit)))
+        self.total = total
+        self.cache: Dict[int, int] = {}
+
+    def __call__(self, n: int) -> int:
+        if n <= self.small_limit:
+            return self.small[n]
+        if n in self.cache:
+            return self.cache[n]
+        root = math.isqrt(n)
+        small = self.small
+        result = self.total(n)
+        # d <= sqrt(n): quotients n // d are big - one by one
+        result -= sum(self(n // d) for d in range(2, root + 1))
+        # d > sqrt(n): quotients q < sqrt(n) are small - d with n // d == q are grouped
+        result -= sum((n // q - max(n // (q + 1), root)) * small[q] for q in range(1, n // (root + 1) + 1))
+        self.cache[n] = result
         return result
 
-    def add_prime(k):
-        """Add founded prime."""
-        primes.append(k)
-        pos = k
-        while pos <= n:
-            numbers[pos] *= power_prime_phi(pos, k)
-            pos += k
-
-    numbers = [1] * (n + 1)
-    numbers[0] = 0
-    numbers[1] = 0
-    primes = []
-    for i in range(2, n + 1):
-        if numbers[i] == 1:
-            add_prime(i)
-    return primes, numbers
+
+class TotientSum(_DirichletSummatory):
+    """
+    Summatory totient function Phi(n) = phi(1) + phi(2) + ... + phi(n) in O(n ** (2/3)) time and memory.
+    Uses identity: sum(Phi(n // d) for d in 1..n) = n * (n + 1) / 2
+    """
+
+    def __init__(self, limit: int):
+        super().__init__(limit, _phi_table, lambda n: n * (n + 1) // 2)
+
+
+def _mobius_table(n: int) -> List[int]:
+    """Moebius function for 0..n - for every prime p multiples change sign and multiples of p * p are zeroed."""
+    mu = [1] * (n + 1)
+    mu[0] = 0
+    for prime in eratosthenes_sieve(n):
+        mu[prime::prime] = [-value for value in mu[prime::prime]]
+        square = prime * prime
+        mu[square::square] = [0] * len(range(square, n + 1, square))
+    return mu
+
+
+class Mertens(_DirichletSummatory):
+    """
+    Mertens function M(n) = mu(1) + mu(2) + ... + mu(n) in O(n ** (2/3)) time and memory.
+    Uses identity: sum(M(n // d) for d in 1..n) = 1
+    """
+
+    def __init__(self, limit: int):
+        super().__init__(limit, _mobius_table, lambda n: 1)
+
+
+def totient_sum(n: int) -> int:
+    """Return phi(1) + phi(2) + ... + phi(n) in O(n ** (2/3)) - see TotientSum."""
+    return TotientSum(n)(n)
+
+
+def floor_sum(n: int, m: int, a: int, b: int) -> int:
+    """
+    Return sum(floor((a * i + b) / m) for i in range(n)) for a, b >= 0, m > 0 in O(log m).
+    Euclid like reduction: the sum of lattice points under the line is computed with swapped axes.
+    """
+    result = 0
+    while True:
+        if a >= m:
+            result += n * (n - 1) // 2 * (a // m)
+            a %= m
+        if b >= m:
+            result += n * (b // m)
+            b %= m
+        y_max = a * n + b
+        if y_max < m:
+            return result
+        n, b = divmod(y_max, m)
+        m, a = a, m
+
+
+def count_fractions_between(p1: int, q1: int, p2: int, q2: int, max_d: int, *, mertens: Mertens = None) -> int:
+    """
+    Count reduced fractions x / y with y <= max_d lying strictly between p1 / q1 and p2 / q2.
+    All pairs (x, y) in interval are counted by floor sums: A(n) = sum(floor((p2 * y - 1) / q2) - floor(p1 * y / q1)),
+    reduced fractions follow from Moebius inversion: R(n) = sum(mu(k) * A(n // k)).
+    k with the same n // k are grouped using Mertens function - O(max_d ** (2/3)) operations.
+    :param p1, q1: left end of interval, 0 <= p1 / q1
+    :param p2, q2: right end of interval, p1 / q1 < p2 / q2
+    :param max_d: the biggest denominator
+    :param mertens: optional Mertens function shared between queries with max_d <= mertens.limit
+    :return: amount of fractions
+    """
+    assert 0 <= p1 and p2 > 0 and q1 > 0 and q2 > 0 and p1 * q2 < p2 * q1
+
+    def pairs(n: int) -> int:
+        return floor_sum(n, q2, p2, p2 - 1) - floor_sum(n, q1, p1, p1)
+
+    if mertens is None:
+        mertens = Mertens(max_d)
+    result = 0
+    k = 1
+    while k <= max_d:
+        quotient = max_d // k
+        k_next = max_d // quotient + 1
+        result += (mertens(k_next - 1) - mertens(k - 1)) * pairs(quotient)
+        k = k_next
+    return result
+
+
+def farey_neighbours(a: int, b: int, n: int) -> Tuple[IntPair, IntPair]:
+    """
+    Find neighbours of a / b in Farey sequence of order n:
+    the biggest fraction smaller than a / b and the smallest fraction bigger than a / b with denominators <= n.
+    Stern-Brocot descent towards a / b moves bound L (or R) by k mediant steps at once, k follows from
+    (L.p + k * R.p) / (L.q + k * R.q) < a / b and L.q + k * R.q <= n, so it takes O(log b) steps
+    (one per continued fraction term of a / b).
+    When a / b itself is reached (b <= n) its neighbours are L + k * a / b and R + k * a / b with biggest k.
+    :param a, b: positive fraction, does not need to be reduced
+    :param n: order of Farey sequence
+    :return: ((left numerator, left denominator), (right numerator, right denominator))
+    """
+    assert a > 0 and b > 0 and n > 0
+    divisor = math.gcd(a, b)
+    a, b = a // divisor, b // divisor
+    lp, lq, rp, rq = 0, 1, 1, 0
+    while lq + rq <= n:
+        mp, mq = lp + rp, lq + rq
+        if mp * b < a * mq:
+            k = (a * lq - lp * b - 1) // (rp * b - a * rq)
+            if rq:
+                k = min(k, (n - lq) // rq)
+            lp, lq = lp + k * rp, lq + k * rq
+        elif mp * b > a * mq:
+            k = min((rp * b - a * rq - 1) // (a * lq - lp * b), (n - rq) // lq)
+            rp, rq = rp + k * lp, rq + k * lq
+        else:
+            k_left, k_right = (n - lq) // b, (n - rq) // b
+            return (lp + k_left * a, lq + k_left * b), (rp + k_right * a, rq + k_right * b)
+    return (lp, lq), (rp, rq)
+
+
+def farey_fractions_between(p1: int, q1: int, p2: int, q2: int, max_d: int) -> Iterator[IntPair]:
+    """
+    Stream reduced fractions x / y with y <= max_d lying strictly between p1 / q1 and p2 / q2 in increasing order.
+    The first fraction is the right Farey neighbour of p1 / q1: x * b - a * y == 1 for a / b == p1 / q1,
+    every next one follows from two previous: k = (max_d + b) // d, (k * c - a) / (k * d - b).
+    :yields: (numerator, denominator)
+    """
+    divisor = math.gcd(p1, q1)
+    a, b = p1 // divisor, q1 // divisor
+    if b > max_d:
+        # p1 / q1 is not in Farey sequence, its neighbours are consecutive terms of it
+        (a, b), (c, d) = farey_neighbours(a, b, max_d)
+    else:
+        # d == -a ** -1 mod b, the biggest d <= max_d
+        d = max_d - (max_d + pow(a, -1, b)) % b if b > 1 else max_d
+        c = (1 + a * d) // b
+    while c * q2 < p2 * d:
+        yield c, d
+        k = (max_d + b) // d
+        a, b, c, d = c, d, k * c - a, k * d - b
+
+
+class SpfTable:
+    """
+    Smallest prime factor table for all numbers up to limit.
+    spf[n] == n for primes (and 0, 1), otherwise spf[n] is the smallest prime dividing n.
+    Number factorization using table takes O(log n) divisions.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        typecode = _primes_typecode(limit)
+        spf = array(typecode, range(limit + 1))
+        if limit >= 4:
+            spf[4::2] = array(typecode, [2]) * len(range(4, limit + 1, 2))
+        # Cross out from the biggest prime, so smaller primes overwrite common multiples
+        for prime in reversed(eratosthenes_sieve(math.isqrt(limit), start=3)):
+            square = prime * prime
+            spf[square::2 * prime] = array(typecode, [prime]) * len(range(square, limit + 1, 2 * prime))
+        self.spf = spf
+
+    def __getitem__(self, num: int) -> int:
+        return self.spf[num]
+
+    def is_prime(self, num: int) -> bool:
+        """Verify if num <= limit is prime."""
+        return num > 1 and self.spf[num] == num
+
+    def prime_divisors(self, num: int) -> Iterator[int]:
+        """
+        Get all num prime divisors in increasing order (1 for num == 1 as core.prime_divisors).
+        :param num: number in range 1..limit
+        :yields: num prime divisors
+        """
+        assert 0 < num <= self.limit
+        if num == 1:
+            yield 1
+        spf = self.spf
+        while num > 1:
+            prime = spf[num]
+            yield prime
+            num //= prime
+
+
+TRIAL_DIVISION_PRIMES = tuple(eratosthenes_sieve(1000))
+TRIAL_DIVISION_PRODUCT = math.prod(TRIAL_DIVISION_PRIMES)
+# Primes < 100 used as prefilter - numbers without them as divisors and < 101 ** 2 are primes
+SMALL_PRIMES = frozenset(TRIAL_DIVISION_PRIMES[:25])
+SMALL_PRIMES_PRODUCT = math.prod(SMALL_PRIMES)
+SMALL_PRIMES_FILTERED_LIMIT = 101 * 101
+# Witnesses making Miller-Rabin test deterministic for all numbers < 2 ** 64
+MILLER_RABIN_WITNESSES_64 = (2, 325, 9375, 28178, 450775, 9780504, 1795265022)
+# Minimal witness sets as (upper bound, witnesses) for numbers below upper bound
+MILLER_RABIN_WITNESSES = (
+    (2047, (2,)),
+    (1373653, (2, 3)),
+    (9080191, (31, 73)),
+    (25326001, (2, 3, 5)),
+    (3215031751, (2, 3, 5, 7)),
+    (4759123141, (2, 7, 61)),
+    (1122004669633, (2, 13, 23, 1662803)),
+    (2152302898747, (2, 3, 5, 7, 11)),
+    (3474749660383, (2, 3, 5, 7, 11, 13)),
+    (341550071728321, (2, 3, 5, 7, 11, 13, 17)),
+    (1 << 64, MILLER_RABIN_WITNESSES_64),
+)
+
+
+def _strong_probable_prime(num: int, base: int) -> bool:
+    """Miller-Rabin round: verify if odd num > 2 is strong probable prime for given base."""
+    # Factor n-1 as d * 2 ** s
+    d = num - 1
+    s = (d & -d).bit_length() - 1
+    d >>= s
+    x = pow(base, d, num)
+    if x == 1 or x == num - 1:
+        return True
+    for _ in range(s - 1):
+        x = x * x % num
+        if x == num - 1:
+            return True
+    return False
+
+
+def _jacobi(a: int, n: int) -> int:
+    """Jacobi symbol (a/n) for odd n > 0."""
+    a %= n
+    result = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+
+def _strong_lucas_probable_prime(num: int) -> bool:
+    """
+    Strong Lucas probable prime test with Selfridge parameters (odd num, not a square).
+    D is the first of 5, -7, 9, -11, ... with Jacobi(D/num) == -1, P = 1, Q = (1 - D) / 4.
+    """
+    d_param = 5
+    while True:
+        jacobi = _jacobi(d_param, num)
+        if jacobi == -1:
+            break
+        if jacobi == 0 and abs(d_param) != num:
+            return False
+        d_param = -d_param - 2 if d_param > 0 else -d_param + 2
+    q_param = (1 - d_param) // 4
+
+    # num + 1 = d * 2 ** s
+    d = num + 1
+    s = (d & -d).bit_length() - 1
+    d >>= s
+
+    def half(value: int) -> int:
+        """Divide by 2 modulo odd num."""
+        if value % 2:
+            value += num
+        return value // 2 % num
+
+    # Compute U(d), V(d) and Q ** d by binary expansion of d starting from k = 1
+    u, v, q_k = 1, 1, q_param % num
+    for bit in bin(d)[3:]:
+        # k -> 2k
+        u, v = u * v % num, (v * v - 2 * q_k) % num
+        q_k = q_k * q_k % num
+        if bit == '1':
+            # k -> k + 1 (P == 1)
+            u, v = half(u + v), half(d_param * u + v)
+            q_k = q_k * q_param % num
+    if u == 0 or v == 0:
+        return True
+    for _ in range(s - 1):
+        v = (v * v - 2 * q_k) % num
+        q_k = q_k * q_k % num
+        if v == 0:
+            return True
+    return False
+
+
+def _is_probable_prime(num: int) -> bool:
+    """
+    Primality test for odd num without small divisors.
+    Deterministic Miller-Rabin for num < 2 ** 64, Baillie-PSW (Miller-Rabin base 2 and strong Lucas) above.
+    """
+    for bound, witnesses in MILLER_RABIN_WITNESSES:
+        if num < bound:
+            for base in witnesses:
+                base %= num
+                if base and not _strong_probable_prime(num, base):
+                    return False
+            return True
+    if not _strong_probable_prime(num, 2):
+        return False
+    root = math.isqrt(num)
+    if root * root == num:
+        return False
+    return _strong_lucas_probable_prime(num)
+
+
+def _is_prime_gcd_filtered(num: int) -> bool:
+    """Verify if num is prime - small primes are filtered by gcd with their product."""
+    if num < 2:
+        return False
+    if math.gcd(num, SMALL_PRIMES_PRODUCT) != 1:
+        return num in SMALL_PRIMES
+    if num < SMALL_PRIMES_FILTERED_LIMIT:
+        return True
+    return _is_probable_prime(num)
+
+
+def _pollard_brent(num: int) -> int:
+    """
+    Find non-trivial divisor of odd composite num using Brent variant of Pollard rho.
+    Products of |x - y| are accumulated in batches, so gcd is computed once per batch.
+    """
+    batch = 128
+    for c in itertools.count(1):
+        y, power, product, divisor = 2, 1, 1, 1
+        x = saved_y = y
+        while divisor == 1:
+            x = y
+            for _ in range(power):
+                y = (y * y + c) % num
+            k = 0
+            while k < power and divisor == 1:
+                saved_y = y
+                for _ in range(min(batch, power - k)):
+                    y = (y * y + c) % num
+                    product = product * abs(x - y) % num
+                divisor = math.gcd(product, num)
+                k += batch
+            power *= 2
+        if divisor == num:
+            # batch overshoot - repeat the last batch step by step
+            divisor = 1
+            while divisor == 1:
+                saved_y = (saved_y * saved_y + c) % num
+                divisor = math.gcd(abs(x - saved_y), num)
+        if divisor != num:
+            return divisor
+    raise ArithmeticError(f"Pollard rho failed for {num}")
+
+
+def _factorize(num: int) -> List[int]:
+    """
+    Return prime factors of num > 0 (with repetition) in increasing order.
+    Small primes are removed by trial division, cofactors are verified by Miller-Rabin
+    and split with Pollard rho.
+    """
+    factors = []
+    # gcd with product of all trial primes tells if any of them divides num, trial division stops
+    # when all of them are removed
+    small_part = math.gcd(num, TRIAL_DIVISION_PRODUCT)
+    for prime in TRIAL_DIVISION_PRIMES:
+        if small_part == 1:
+            break
+        if small_part % prime == 0:
+            small_part //= prime
+            while num % prime == 0:
+                factors.append(prime)
+                num //= prime
+    if num > 1:
+        pending = [num]
+        trial_limit = TRIAL_DIVISION_PRIMES[-1] ** 2
+        while pending:
+            num = pending.pop()
+            if num < trial_limit or _is_probable_prime(num):
+                factors.append(num)
+                continue
+            root = math.isqrt(num)
+            if root * root == num:
+                pending += [root, root]
+                continue
+            divisor = _pollard_brent(num)
+            pending += [divisor, num // divisor]
+    factors.sort()
+    return factors
+
+
+FACTORIZATION_CACHE_SIZE = 1 << 14  # recently factorized numbers kept by factorization
+
+
+@lru_cache(maxsize=FACTORIZATION_CACHE_SIZE)
+def factorization(num: int) -> Tuple[int, ...]:
+    """
+    Return prime factors of num > 0 (with repetition) in increasing order.
+    Pipeline of trial division by small primes, deterministic primality test of cofactor and Pollard rho,
+    results for recently seen numbers are kept in bounded LRU cache, so repeated queries are free.
+    """
+    assert num > 0, "factorization works with num > 0"
+    return tuple(_factorize(num))
+
+
+def largest_prime_factor(num: int) -> int:
+    """Return the largest prime factor of num > 0 (1 for num == 1)."""
+    factors = factorization(num)
+    return factors[-1] if factors else 1
+
+
+def _prime_power_sums(x: int, power: int) -> Tuple[List[int], List[int]]:
+    """
+    Lucy_Hedgehog algorithm - sums of p ** power over primes p <= v for all values v = x // i.
+    Sieve runs over O(sqrt(x)) distinct values x // i, each prime p <= sqrt(x) updates values >= p * p:
+        S(v) -= p ** power * (S(v // p) - S(p - 1))
+    Total O(x ** (3/4)) operations, every prime step is done by list comprehension.
+    :return: small, large - small[v] = S(v) for v <= sqrt(x), large[i] = S(x // i) for i <= sqrt(x)
+    """
+    root = math.isqrt(x)
+
+    def initial(v: int) -> int:
+        """Sum of k ** power for 2 <= k <= v."""
+        return v - 1 if power == 0 else v * (v + 1) // 2 - 1
+
+    small = [0] + [initial(v) for v in range(1, root + 1)]
+    large = [0] + [initial(x // i) for i in range(1, root + 1)]
+    for prime in range(2, root + 1):
+        if small[prime] == small[prime - 1]:
+            # not a prime
+            continue
+        weight = prime ** power
+        previous = small[prime - 1]
+        square = prime * prime
+        # large values x // i >= square
+        large_end = min(root, x // square)
+        inner_end = min(large_end, root // prime)
+        large[1:inner_end + 1] = [large[i] - weight * (large[i * prime] - previous)
+                                  for i in range(1, inner_end + 1)]
+        large[inner_end + 1:large_end + 1] = [large[i] - weight * (small[x // (i * prime)] - previous)
+                                              for i in range(inner_end + 1, large_end + 1)]
+        # small values v >= square
+        if square <= root:
+            small[square:] = [small[v] - weight * (small[v // prime] - previous)
+                              for v in range(square, root + 1)]
+    return small, large
+
+
+def prime_pi(x: int) -> int:
+    """
+    Prime counting function - amount of primes <= x in O(x ** (3/4)) time and O(sqrt(x)) memory.
+    :param x:
+    :return: pi(x)
+    """
+    if x < 2:
+        return 0
+    _, large = _prime_power_sums(x, 0)
+    return large[1]
+
+
+def prime_sum(x: int) -> int:
+    """
+    Sum of primes <= x in O(x ** (3/4)) time and O(sqrt(x)) memory.
+    :param x:
+    :return: sum of primes p <= x
+    """
+    if x < 2:
+        return 0
+    _, large = _prime_power_sums(x, 1)
+    return large[1]
+
+
+def nth_prime_bounds(n: int) -> IntPair:
+    """
+    Return lower and upper bound of n-th prime.
+    Dusart: p(n) >= n * (ln n + ln ln n - 1) for n >= 2, Rosser: p(n) <= n * (ln n + ln ln n) for n >= 6.
+    :param n: prime index (1-based)
+    :return: (lower, upper) with lower <= p(n) <= upper
+    """
+    assert n > 0, "primes are indexed from 1"
+    if n < 6:
+        prime = (2, 3, 5, 7, 11)[n - 1]
+        return prime, prime
+    log_n = math.log(n)
+    log_log_n = math.log(log_n)
+    return int(n * (log_n + log_log_n - 1)), math.ceil(n * (log_n + log_log_n))
+
+
+def first_primes(n: int) -> array:
+    """Return the first n primes, sieve size is given exactly by upper bound of n-th prime."""
+    if n == 0:
+        return array(_primes_typecode(1))
+    return eratosthenes_sieve(nth_prime_bounds(n)[1])[:n]
+
+
+def nth_prime(n: int) -> int:
+    """
+    Return n-th prime (nth_prime(1) == 2).
+    When upper bound of p(n) is within IS_PRIME_SIEVE_LIMIT the prime is selected from shared PrimeSet bitmap.
+    Otherwise estimate p(n) ~ n * (ln n + ln ln n - 1 + (ln ln n - 2) / ln n) clamped to nth_prime_bounds,
+    count primes up to estimate with prime_pi and finish with short segmented sieve in the window
+    between estimate and p(n) - windows never cross the bounds.
+    :param n: prime index (1-based)
+    :return: n-th prime
+    """
+    lower, upper = nth_prime_bounds(n)
+    if upper <= IS_PRIME_SIEVE_LIMIT:
+        return _shared_prime_set().select(n)
+    log_n = math.log(n)
+    log_log_n = math.log(log_n)
+    estimate = int(n * (log_n + log_log_n - 1 + (log_log_n - 2) / log_n))
+    estimate = min(max(estimate, lower), upper)
+    counter = prime_pi(estimate)
+    window = max(1 << 16, int(log_n * math.sqrt(estimate)))
+    # p(n) above estimate - sieve forward window by window
+    low = estimate + 1
+    while counter < n:
+        primes = eratosthenes_sieve(min(low + window, upper), start=low)
+        if counter + len(primes) >= n:
+            return primes[n - counter - 1]
+        counter += len(primes)
+        low += window + 1
+    # p(n) <= estimate - sieve backward window by window
+    high = estimate
+    while True:
+        low = max(lower, high - window)
+        primes = eratosthenes_sieve(high, start=low)
+        if counter - len(primes) < n:
+            return primes[n - (counter - len(primes)) - 1]
+        counter -= len(primes)
+        high = low - 1
+
+
+_BITS_AS_DIGITS = bytes.maketrans(b'\x00\x01', b'01')
+
+
+class PrimeSet:
+    """
+    Primes <= limit kept as odd-only bitmap (bit i of the bitmap represents 2 * i + 1) - about limit / 16 bytes.
+    Membership is O(1) bit test, rank (pi(n)) uses prefix counters of blocks and popcount of the last block.
+    """
+
+    BLOCK_BYTES = 64  # bitmap bytes per block of rank index (1024 numbers)
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        bitmap = bytearray()
+        pending = bytearray(b'\x00')  # number 1 is not prime
+        for _, segment in _sieve_flag_segments(limit, 3, SIEVE_SEGMENT_SIZE):
+            pending += segment
+            full = len(pending) & ~7
+            bitmap += self._pack(pending[:full])
+            del pending[:full]
+        if pending:
+            bitmap += self._pack(pending + bytes(8 - len(pending)))
+        self.bitmap = bitmap
+        # block_ranks[k] - amount of odd primes in blocks before k
+        block_ranks = array('Q', [0])
+        for start in range(0, len(bitmap), self.BLOCK_BYTES):
+            block = int.from_bytes(bitmap[start:start + self.BLOCK_BYTES], 'little')
+            block_ranks.append(block_ranks[-1] + block.bit_count())
+        self.block_ranks = block_ranks
+
+    @staticmethod
+    def _pack(flags: bytearray) -> bytes:
+        """Pack 0/1 flags (length multiple of 8) into bytes, flag i as bit i."""
+        if not flags:
+            return b''
+        return int(flags.translate(_BITS_AS_DIGITS)[::-1], 2).to_bytes(len(flags) // 8, 'little')
+
+    def _bit(self, index: int) -> int:
+        return self.bitmap[index >> 3] >> (index & 7) & 1
+
+    def __contains__(self, num: int) -> bool:
+        """Verify if num is prime - O(1) for num <= limit, Miller-Rabin above."""
+        if num > self.limit:
+            return _is_prime_gcd_filtered(num)
+        if num % 2 == 0:
+            return num == 2
+        return num > 0 and self._bit(num >> 1) == 1
+
+    def __len__(self) -> int:
+        return self.rank(self.limit)
+
+    def __iter__(self) -> Iterator[int]:
+        if self.limit >= 2:
+            yield 2
+        for index in itertools.compress(itertools.count(), self._flags()):
+            num = 2 * index + 1
+            if num > self.limit:
+                return
+            yield num
+
+    def _flags(self) -> Iterator[int]:
+        """Yield bitmap bits one by one."""
+        for byte in self.bitmap:
+            for bit in range(8):
+                yield byte >> bit & 1
+
+    def rank(self, num: int) -> int:
+        """Return pi(num) - amount of primes <= num (num <= limit)."""
+        assert num <= self.limit, f"{num} above PrimeSet limit {self.limit}"
+        if num < 2:
+            return 0
+        # odd numbers 1, 3, ..., num have indexes 0..last
+        last = (num - 1) >> 1
+        byte_index = last >> 3
+        block, offset = divmod(byte_index, self.BLOCK_BYTES)
+        block_start = block * self.BLOCK_BYTES
+        counter = self.block_ranks[block]
+        counter += int.from_bytes(self.bitmap[block_start:byte_index], 'little').bit_count()
+        counter += (self.bitmap[byte_index] & ((2 << (last & 7)) - 1)).bit_count()
+        # add 2
+        return counter + 1
+
+    def select(self, i: int) -> int:
+        """Return i-th prime (select(1) == 2), inverse of rank for primes."""
+        assert 0 < i <= len(self), f"PrimeSet has not {i} primes"
+        if i == 1:
+            return 2
+        odd_rank = i - 1
+        # last block with less than odd_rank primes before it
+        block = bisect_left(self.block_ranks, odd_rank) - 1
+        counter = self.block_ranks[block]
+        byte_index = block * self.BLOCK_BYTES
+        while True:
+            byte = self.bitmap[byte_index]
+            bits = byte.bit_count()
+            if counter + bits >= odd_rank:
+                break
+            counter += bits
+            byte_index += 1
+        for bit in range(8):
+            if byte >> bit & 1:
+                counter += 1
+                if counter == odd_rank:
+                    return 2 * (8 * byte_index + bit) + 1
+        raise AssertionError("select failed")  # pragma: no cover
+
+    def next_prime(self, num: int) -> int:
+        """Return the smallest prime > num."""
+        if num < 2:
+            return 2
+        candidate = num + 1 if num % 2 == 0 else num + 2
+        while candidate <= self.limit:
+            if self._bit(candidate >> 1):
+                return candidate
+            candidate += 2
+        raise ValueError(f"No prime > {num} below PrimeSet limit {self.limit}")
+
+    def prev_prime(self, num: int) -> int:
+        """Return the biggest prime < num."""
+        if num <= 2:
+            raise ValueError(f"No prime < {num}")
+        if num > self.limit + 1:
+            raise ValueError(f"Prime < {num} may be above PrimeSet limit {self.limit}")
+        if num == 3:
+            return 2
+        candidate = num - 1 if num % 2 == 0 else num - 2
+        while candidate > 2:
+            if self._bit(candidate >> 1):
+                return candidate
+            candidate -= 2
+        return 2
 
 
 def is_in_sorted_list(primes, n):
@@ -518,6 +1842,22 @@ def is_in_sorted_list(primes, n):
     return False
 
 
+def ext_gcd(a: int, b: int) -> Tuple[int, int, int]:
+    """
+    Compute Extended Euclid GCD Algorithm iteratively.
+    :return: g, x, y such that g == gcd(a, b) == a * x + b * y
+    """
+    old_r, r = a, b
+    old_x, x = 1, 0
+    old_y, y = 0, 1
+    while r:
+        quotient = old_r // r
+        old_r, r = r, old_r - quotient * r
+        old_x, x = x, old_x - quotient * x
+        old_y, y = y, old_y - quotient * y
+    return old_r, old_x, old_y
+
+
 def eegcd(a, b):
     """Compute Extend Euclid GCD Algorithm.
     Return g, x, y such that:
@@ -525,20 +1865,50 @@ def eegcd(a, b):
     a * b // g = LCM(a, b)
     g = a * x + b * y
     """
-    if a == 0:
-        return b, 0, 1
-    g, y, x = eegcd(b % a, a)
-    return g, x - (b // a) * y, y
-"""
-    Non recursive: for test
-    s = 0; old_s = 1
-    t = 1; old_t = 0
-    r = b; old_r = a
-
-    while r != 0:
-        quotient = old_r//r 
-        old_r, r = r, old_r - quotient*r
-        old_s, s = s, old_s - quotient*s
-        old_t, t = t, old_t - quotient*t
-    return [old_r, old_s, old_t]
-"""
\ No newline at end of file
+    return ext_gcd(a, b)
+
+
+def mod_inverse(a: int, m: int) -> int:
+    """
+    Modular inverse of a.
+    :return: x in range(m) such that a * x % m == 1 % m
+    :raise ValueError: gcd(a, m) != 1
+    """
+    return pow(a, -1, m)
+
+
+def batch_mod_inverse(values: Sequence[int], m: int) -> List[int]:
+    """
+    Modular inverses of all values with one modular inversion (Montgomery's trick):
+    prefix products are inverted once, then inverses are peeled off from the back by 2 multiplications each.
+    :raise ValueError: any of values is not invertible modulo m
+    """
+    prefix = list(itertools.accumulate(values, lambda product, value: product * value % m, initial=1 % m))
+    inverse = pow(prefix[-1], -1, m)
+    result = [0] * len(values)
+    for i in range(len(values) - 1, -1, -1):
+        result[i] = inverse * prefix[i] % m
+        inverse = inverse * values[i] % m
+    return result
+
+
+def crt(residues: Sequence[int], moduli: Sequence[int]) -> IntPair:
+    """
+    Chinese Remainder Theorem for moduli which do not need to be coprime.
+    Congruences are merged pairwise: x == r1 (mod m1), x == r2 (mod m2) is solvable iff g = gcd(m1, m2) divides r2 - r1,
+    then x == r1 + m1 * t (mod lcm(m1, m2)) with t == (r2 - r1) / g * (m1 / g) ** -1 (mod m2 / g).
+    :return: (x, lcm of moduli) with 0 <= x < lcm
+    :raise ValueError: congruences are inconsistent
+    """
+    x, modulus = 0, 1
+    for residue, m in zip(residues, moduli):
+        g = math.gcd(modulus, m)
+        difference = residue - x
+        if difference % g:
+            raise ValueError(f"x == {residue} (mod {m}) is inconsistent with x == {x} (mod {modulus})")
+        m_g = m // g
+        t = difference // g * pow(modulus // g, -1, m_g) % m_g
+        x += modulus * t
+        modulus *= m_g
+        x %= modulus
+    return x, modulus
@@ -1,7 +1,58 @@
 import pytest
-from itertools import islice
+import math
+from itertools import islice, accumulate, takewhile
 from core import (
  count_divisible_in_range,
+ eratosthenes_sieve,
+ eratosthenes_sieve_it,
+ prime_divisors,
+ prime_factors_with_powers,
+ normalized_prime_factors_with_powers,
+ SpfTable,
+ linear_sieve,
+ phi_sieve,
+ is_prime_Miller_Rabin,
+ are_prime,
+ prime_pi,
+ prime_sum,
+ nth_prime,
+ divisors_of,
+ divisor_count,
+ divisor_sum,
+ sum_divisible_in_range,
+ multiples_of,
+ cached_primes,
+ PrimeSet,
+ is_prime_tier,
+ totient_sum,
+ TotientSum,
+ sieve_segments,
+ floor_sum,
+ Mertens,
+ count_fractions_between,
+ farey_fractions_between,
+ farey_neighbours,
+ ext_gcd,
+ mod_inverse,
+ batch_mod_inverse,
+ crt,
+ fibonacci,
+ fib,
+ fib_mod,
+ fib_pair,
+ pisano_period,
+ fib_index_with_digits,
+ even_fibonacci_sum,
+ partitions,
+ partition_count,
+ lcm_upto,
+ LcmTable,
+ count_distinct_powers,
+ DivisibleSum,
+ factorization,
+ largest_prime_factor,
+ nth_prime_bounds,
+ first_primes,
 )
 
 
@@ -21,3 +72,530 @@ divisible_table = [
 @pytest.mark.parametrize("divisors, num, expected", divisible_table)
 def test_count_divisible_in_range(divisors, num, expected):
     assert count_divisible_in_range(divisors, num) == expected
+
+
+sieve_table = [
+    (1, 2, []),
+    (2, 2, [2]),
+    (10, 2, [2, 3, 5, 7]),
+    (30, 2, [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]),
+    (30, 10, [11, 13, 17, 19, 23, 29]),
+    (30, 11, [11, 13, 17, 19, 23, 29]),
+    (30, 30, []),
+]
+
+
+@pytest.mark.parametrize("n, start, expected", sieve_table)
+def test_eratosthenes_sieve(n, start, expected):
+    assert list(eratosthenes_sieve(n, start=start)) == expected
+
+
+def test_sieve_segments():
+    primes = list(eratosthenes_sieve(10 ** 5))
+    assert len(primes) == 9592
+    segmented = [p for block in sieve_segments(10 ** 5, segment_size=101) for p in block]
+    assert segmented == primes
+
+
+@pytest.mark.parametrize("start", [0, 2, 6, 7, 48, 49, 50, 1000, 10 ** 5 + 3])
+def test_eratosthenes_sieve_it(start):
+    expected = [p for p in eratosthenes_sieve(2 * 10 ** 5) if p >= start][:5000]
+    assert list(islice(eratosthenes_sieve_it(start=start), len(expected))) == expected
+
+
+def test_spf_table():
+    spf = SpfTable(1000)
+    assert [n for n in range(1001) if spf.is_prime(n)] == list(eratosthenes_sieve(1000))
+    for num in range(1, 1001):
+        assert list(prime_divisors(num, spf=spf)) == list(prime_divisors(num))
+        assert prime_factors_with_powers(num, spf=spf) == prime_factors_with_powers(num)
+        assert normalized_prime_factors_with_powers(num, spf=spf) == normalized_prime_factors_with_powers(num)
+    # above the limit falls back to default factorization
+    assert list(prime_divisors(1009 * 1013, spf=spf)) == [1009, 1013]
+
+
+def test_linear_sieve():
+    primes, functions = linear_sieve(12, phi=True, mu=True, tau=True, omega=True, sigma=(1,),
+                                     prime_power={'square': lambda p, e: p ** (2 * e)})
+    assert list(primes) == [2, 3, 5, 7, 11]
+    #                                0  1  2  3  4  5  6  7  8  9  10  11  12
+    assert list(functions['phi']) == [0, 1, 1, 2, 2, 4, 2, 6, 4, 6, 4, 10, 4]
+    assert list(functions['mu']) == [0, 1, -1, -1, 0, -1, 1, -1, 0, 0, 1, -1, 0]
+    assert list(functions['tau']) == [0, 1, 2, 2, 3, 2, 4, 2, 4, 3, 4, 2, 6]
+    assert list(functions['omega']) == [0, 0, 1, 1, 1, 1, 2, 1, 1, 1, 2, 1, 2]
+    assert list(functions['sigma1']) == [0, 1, 3, 4, 7, 6, 12, 8, 15, 13, 18, 12, 28]
+    assert list(functions['square']) == [n * n for n in range(13)]
+
+
+def test_linear_sieve_big_sigma():
+    n = 10 ** 5
+    _, functions = linear_sieve(n, sigma=(3, 4))
+    for num in (n, 83160, 99991, 65536):
+        assert functions['sigma3'][num] == divisor_sum(num, power=3)
+        assert functions['sigma4'][num] == divisor_sum(num, power=4)
+    assert isinstance(functions['sigma4'], list)
+
+
+def test_phi_sieve():
+    primes, phi = phi_sieve(10)
+    assert list(primes) == [2, 3, 5, 7]
+    assert list(phi) == [0, 0, 1, 2, 2, 4, 2, 6, 4, 6, 4]
+
+
+big_factors_table = [
+    (600851475143, [(71, 1), (839, 1), (1471, 1), (6857, 1)]),
+    (999999937 * 999999929, [(999999929, 1), (999999937, 1)]),
+    (1000003 ** 2 * 1000033, [(1000003, 2), (1000033, 1)]),
+    (2 ** 61 - 1, [(2 ** 61 - 1, 1)]),
+    (2 ** 64 + 1, [(274177, 1), (67280421310721, 1)]),
+]
+
+
+@pytest.mark.parametrize("num, expected", big_factors_table)
+def test_prime_factors_with_powers_big(num, expected):
+    assert prime_factors_with_powers(num) == expected
+
+
+miller_rabin_table = [
+    (1, False),
+    (2, True),
+    (97, True),
+    (561, False),
+    (2047, False),
+    (3215031751, False),
+    (2152302898747, False),
+    (341550071728321, False),
+    (3825123056546413051, False),
+    (18446744073709551557, True),
+    (318665857834031151167461, False),
+    (3317044064679887385961981, False),
+    (2 ** 89 - 1, True),
+    ((2 ** 61 - 1) * (2 ** 89 - 1), False),
+]
+
+
+@pytest.mark.parametrize("num, expected", miller_rabin_table)
+def test_is_prime_miller_rabin(num, expected):
+    assert is_prime_Miller_Rabin(num) == expected
+    assert is_prime_Miller_Rabin(num, primes=[2, 3, 5, 7, 11, 13]) == expected
+
+
+def test_are_prime():
+    primes = set(eratosthenes_sieve(20000))
+    assert are_prime(range(20000)) == [n in primes for n in range(20000)]
+    big = [-7, -2, 10 ** 9 + 7, 10 ** 9 + 9, 10 ** 9 + 11, 2 ** 61 - 1, 2 ** 67 - 1, 19997, 2]
+    assert are_prime(big) == [False, False, True, True, False, True, False, True, True]
+    assert are_prime([]) == []
+
+
+prime_pi_table = [
+    (0, 0, 0),
+    (1, 0, 0),
+    (2, 1, 2),
+    (10, 4, 17),
+    (100, 25, 1060),
+    (2 * 10 ** 6, 148933, 142913828922),
+    (10 ** 9, 50847534, 24739512092254535),
+]
+
+
+@pytest.mark.parametrize("x, pi, total", prime_pi_table)
+def test_prime_pi_and_sum(x, pi, total):
+    assert prime_pi(x) == pi
+    assert prime_sum(x) == total
+
+
+nth_prime_table = [
+    (1, 2),
+    (6, 13),
+    (7, 17),
+    (10001, 104743),
+    (60000, 746773),
+    (82025, 1048573),
+    (82026, 1048583),
+    (10 ** 6, 15485863),
+]
+
+
+@pytest.mark.parametrize("n, expected", nth_prime_table)
+def test_nth_prime(n, expected):
+    assert nth_prime(n) == expected
+
+
+divisors_of_table = [
+    (1, [1]),
+    (7, [1, 7]),
+    (12, [1, 2, 3, 4, 6, 12]),
+    (36, [1, 2, 3, 4, 6, 9, 12, 18, 36]),
+    (220, [1, 2, 4, 5, 10, 11, 20, 22, 44, 55, 110, 220]),
+]
+
+
+@pytest.mark.parametrize("num, expected", divisors_of_table)
+def test_divisors_of(num, expected):
+    assert sorted(divisors_of(num)) == expected
+    assert list(divisors_of(num, ordered=True)) == expected
+    assert list(divisors_of(num, ordered=True, predicate=lambda d: d % 2)) == [d for d in expected if d % 2]
+    assert divisor_count(num) == len(expected)
+    assert divisor_sum(num) == sum(expected)
+    assert divisor_sum(num, power=2) == sum(d * d for d in expected)
+
+
+def test_divisor_count_highly_composite():
+    assert divisor_count(963761198400) == 6720
+    assert divisor_sum(284) - 284 == 220
+
+
+divisible_sum_table = [
+    ([3, 5], 10, 23),
+    ([3, 5], 1000, 233168),
+    ([3, 6, 9], 10, 18),
+    ([1], 5, 10),
+    ([7], 7, 0),
+]
+
+
+@pytest.mark.parametrize("divisors, stop, expected", divisible_sum_table)
+def test_sum_divisible_in_range(divisors, stop, expected):
+    assert sum_divisible_in_range(divisors, stop) == expected
+
+
+def test_count_divisible_in_range_huge_lcm():
+    divisors = [1009, 1013, 1019, 1021, 1031, 1033, 1039, 1049, 1051, 1061]
+    assert count_divisible_in_range(divisors, 10 ** 9) == 9644549
+
+
+def test_multiples_of():
+    assert multiples_of([3, 5]) == (7, 15, 7 / 15)
+
+
+def test_cached_primes(tmp_path):
+    primes = cached_primes(1000, cache_dir=str(tmp_path))
+    assert list(primes) == list(eratosthenes_sieve(1000))
+    # extended on demand and reused for smaller limits
+    assert list(cached_primes(5000, cache_dir=str(tmp_path))) == list(eratosthenes_sieve(5000))
+    assert list(cached_primes(10, cache_dir=str(tmp_path))) == [2, 3, 5, 7]
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+@pytest.mark.parametrize("size", [0, 10, 33, 1000])
+def test_cached_primes_corrupted(tmp_path, size):
+    cached_primes(1000, cache_dir=str(tmp_path / 'good'))
+    cache_file, = (tmp_path / 'good').iterdir()
+    corrupted = tmp_path / 'corrupted'
+    corrupted.mkdir()
+    # truncated copy of valid cache file is rebuilt
+    (corrupted / cache_file.name).write_bytes(cache_file.read_bytes()[:size])
+    assert list(cached_primes(100, cache_dir=str(corrupted))) == list(eratosthenes_sieve(100))
+
+
+def test_prime_set():
+    primes = list(eratosthenes_sieve(10 ** 4))
+    prime_set = PrimeSet(10 ** 4)
+    assert list(prime_set) == primes
+    assert len(prime_set) == len(primes) == 1229
+    assert [n for n in range(10 ** 4 + 1) if n in prime_set] == primes
+    assert 10 ** 9 + 7 in prime_set
+    assert prime_set.rank(100) == 25
+    assert prime_set.rank(97) == 25
+    assert prime_set.select(25) == 97
+    assert all(prime_set.select(i) == p for i, p in enumerate(primes, start=1))
+    assert prime_set.next_prime(1) == 2
+    assert prime_set.next_prime(97) == 101
+    assert prime_set.prev_prime(97) == 89
+    assert prime_set.prev_prime(3) == 2
+    assert PrimeSet(100).prev_prime(101) == 97
+    for num in (102, 10 ** 6):
+        with pytest.raises(ValueError):
+            PrimeSet(100).prev_prime(num)
+    with pytest.raises(ValueError):
+        PrimeSet(100).next_prime(97)
+
+
+prime_tier_table = [
+    (1, None, False, 'trial'),
+    (97, None, True, 'sieve'),
+    (97, [2, 3, 5, 7, 11], True, 'table'),
+    (2 ** 20 + 7, None, True, 'miller-rabin'),
+    (1009 * 1013, [2, 3, 5], False, 'sieve'),
+    (7919 * 7927 * 25, None, False, 'trial'),
+    (7919 * 7927, None, False, 'miller-rabin'),
+    (2 ** 61 - 1, None, True, 'miller-rabin'),
+]
+
+
+@pytest.mark.parametrize("num, primes, expected, tier", prime_tier_table)
+def test_is_prime_tier(num, primes, expected, tier):
+    assert is_prime_tier(num, primes=primes) == (expected, tier)
+
+
+@pytest.mark.parametrize("n, expected", [(1, 1), (8, 22), (10 ** 6, 303963552392), (10 ** 8, 3039635516365908)])
+def test_totient_sum(n, expected):
+    assert totient_sum(n) == expected
+
+
+def test_totient_sum_queries():
+    _, phi = phi_sieve(2000)
+    summatory = TotientSum(2000)
+    # phi_sieve keeps phi(1) == 0
+    assert [summatory(n) - 1 for n in range(2, 2001)] == list(accumulate(phi))[2:]
+
+
+def test_totient_sum_many_queries():
+    _, phi = phi_sieve(10 ** 6)
+    expected = list(accumulate(phi))
+    summatory = TotientSum(10 ** 6)
+    for n in range(2, 10 ** 6 + 1, 997):
+        assert summatory(n) - 1 == expected[n]
+
+
+def test_mertens():
+    mertens = Mertens(10 ** 6)
+    assert [mertens(n) for n in range(1, 11)] == [1, 0, -1, -1, -2, -1, -2, -2, -2, -1]
+    assert mertens(10 ** 6) == 212
+    assert Mertens(10 ** 8)(10 ** 8) == 1928
+
+
+@pytest.mark.parametrize("n, m, a, b", [(0, 3, 1, 1), (4, 10, 6, 3), (6, 5, 4, 3), (100, 7, 33, 101), (13, 1, 2, 0)])
+def test_floor_sum(n, m, a, b):
+    assert floor_sum(n, m, a, b) == sum((a * i + b) // m for i in range(n))
+
+
+count_fractions_table = [
+    (1, 3, 1, 2, 8, 3),
+    (1, 3, 1, 2, 12000, 7295372),
+    (0, 1, 1, 1, 8, 21),
+    (3, 7, 1, 2, 13, 3),
+]
+
+
+@pytest.mark.parametrize("p1, q1, p2, q2, max_d, expected", count_fractions_table)
+def test_count_fractions_between(p1, q1, p2, q2, max_d, expected):
+    assert count_fractions_between(p1, q1, p2, q2, max_d) == expected
+
+
+def test_farey_fractions_between():
+    assert list(farey_fractions_between(1, 3, 1, 2, 8)) == [(3, 8), (2, 5), (3, 7)]
+    # 3 / 10 is not in Farey sequence of order 8
+    assert list(farey_fractions_between(3, 10, 1, 2, 8)) == [(1, 3), (3, 8), (2, 5), (3, 7)]
+    assert sum(1 for _ in farey_fractions_between(1, 3, 1, 2, 1000)) == count_fractions_between(1, 3, 1, 2, 1000)
+
+
+farey_neighbours_table = [
+    (3, 7, 8, ((2, 5), (1, 2))),
+    (3, 7, 1000000, ((428570, 999997), (428569, 999994))),
+    (119, 17419, 22835, ((156, 22835), (82, 12003))),
+    (6, 14, 7, ((2, 5), (1, 2))),
+    (3, 10, 8, ((2, 7), (1, 3))),
+    (2, 1, 3, ((5, 3), (7, 3))),
+    (1, 1000, 8, ((0, 1), (1, 8))),
+]
+
+
+@pytest.mark.parametrize("a, b, n, expected", farey_neighbours_table)
+def test_farey_neighbours(a, b, n, expected):
+    assert farey_neighbours(a, b, n) == expected
+
+
+@pytest.mark.parametrize("a, b", [(0, 5), (5, 0), (240, 46), (17, 5), (10 ** 20, 3 ** 40), (3 ** 2000, 2 ** 3000 + 1)])
+def test_ext_gcd(a, b):
+    g, x, y = ext_gcd(a, b)
+    assert g == math.gcd(a, b) and a * x + b * y == g
+
+
+def test_mod_inverse():
+    assert mod_inverse(3, 7) == 5
+    assert batch_mod_inverse([1, 5, 7, 11], 12) == [1, 5, 7, 11]
+    assert batch_mod_inverse(range(1, 1000), 1009) == [mod_inverse(i, 1009) for i in range(1, 1000)]
+    assert batch_mod_inverse([], 7) == []
+    with pytest.raises(ValueError):
+        batch_mod_inverse([1, 2, 3], 6)
+
+
+crt_table = [
+    ([], [], (0, 1)),
+    ([2, 3, 2], [3, 5, 7], (23, 105)),
+    ([1, 3], [4, 6], (9, 12)),
+    ([5, 11], [12, 18], (29, 36)),
+    ([7], [5], (2, 5)),
+]
+
+
+@pytest.mark.parametrize("residues, moduli, expected", crt_table)
+def test_crt(residues, moduli, expected):
+    assert crt(residues, moduli) == expected
+
+
+def test_crt_inconsistent():
+    with pytest.raises(ValueError):
+        crt([1, 2], [4, 6])
+
+
+def test_fib():
+    expected = list(islice(fibonacci(), 500))
+    assert [fib(n) for n in range(500)] == expected
+    assert [fib_pair(n) for n in range(499)] == list(zip(expected, expected[1:]))
+    assert [fib_mod(n, 1000) for n in range(500)] == [f % 1000 for f in expected]
+    assert fib_mod(10 ** 18, 10 ** 9 + 7) == 209783453
+
+
+@pytest.mark.parametrize("m, expected", [(1, 1), (2, 3), (5, 20), (10, 60), (11, 10), (13, 28), (100, 300),
+                                         (10 ** 9, 1500000000), (10 ** 9 + 7, 2000000016)])
+def test_pisano_period(m, expected):
+    assert pisano_period(m) == expected
+
+
+@pytest.mark.parametrize("d, expected", [(1, 1), (2, 7), (3, 12), (1000, 4782), (5000, 23922)])
+def test_fib_index_with_digits(d, expected):
+    assert fib_index_with_digits(d) == expected
+
+
+def test_partitions_no_copy():
+    for n in range(1, 15):
+        assert [partition[:] for partition in partitions(n, copy=False)] == list(partitions(n))
+
+
+partition_count_table = [
+    (0, {}, 1),
+    (5, {}, 7),
+    (100, {}, 190569292),
+    (10 ** 4, {'mod': 10 ** 9 + 7}, 17783467),
+    (100, {'parts': [1, 5, 10, 25, 50]}, 292),
+    (200, {'parts': [1, 2, 5, 10, 20, 50, 100, 200]}, 73682),
+    (10, {'max_parts': 3}, 14),
+    (10, {'parts': [1, 2, 3], 'max_parts': 4}, 2),
+    (7, {'parts': [2, 4]}, 0),
+    (-1, {}, 0),
+]
+
+
+@pytest.mark.parametrize("n, restrictions, expected", partition_count_table)
+def test_partition_count(n, restrictions, expected):
+    assert partition_count(n, **restrictions) == expected
+
+
+def test_partition_count_brute_force():
+    for n in range(1, 20):
+        all_partitions = list(partitions(n))
+        assert partition_count(n) == len(all_partitions)
+        for k in range(6):
+            assert partition_count(n, max_parts=k) == sum(len(p) <= k for p in all_partitions)
+            assert partition_count(n, parts={2, 3, 7}, max_parts=k) == \
+                sum(len(p) <= k and set(p) <= {2, 3, 7} for p in all_partitions)
+
+
+lcm_upto_table = [
+    (0, None, 1),
+    (1, None, 1),
+    (10, None, 2520),
+    (20, None, 232792560),
+    (40, None, 5342931457063200),
+    (40, 10 ** 9 + 7, 5342931457063200 % (10 ** 9 + 7)),
+    (10 ** 5, 10 ** 9 + 7, 59814054),
+]
+
+
+@pytest.mark.parametrize("n, mod, expected", lcm_upto_table)
+def test_lcm_upto(n, mod, expected):
+    assert lcm_upto(n, mod=mod) == expected
+
+
+def test_lcm_table():
+    table = LcmTable(500)
+    table_mod = LcmTable(500, mod=10 ** 9 + 7)
+    for n in range(501):
+        expected = math.lcm(*range(1, n + 1))
+        assert table[n] == expected
+        assert table_mod[n] == expected % (10 ** 9 + 7)
+    assert LcmTable(10 ** 6, mod=10 ** 9 + 7)[10 ** 6] == lcm_upto(10 ** 6, mod=10 ** 9 + 7)
+
+
+@pytest.mark.parametrize("n, expected", [(1, 0), (2, 1), (5, 15), (100, 9183), (10 ** 5, 9981236306)])
+def test_count_distinct_powers(n, expected):
+    assert count_distinct_powers(n) == expected
+
+
+def test_count_distinct_powers_brute_force():
+    for n in range(2, 70):
+        assert count_distinct_powers(n) == len({a ** b for a in range(2, n + 1) for b in range(2, n + 1)})
+
+
+divisible_sum_class_table = [
+    ([3, 5], 10, 23),
+    ([3, 5], 1000, 233168),
+    ([3, 5], 10 ** 18, 233333333333333333166666666666666668),
+    ([], 100, 0),
+    ([1], 11, 55),
+    ([4, 6, 12], 25, 4 + 6 + 8 + 12 + 16 + 18 + 20 + 24),
+]
+
+
+@pytest.mark.parametrize("divisors, stop, expected", divisible_sum_class_table)
+def test_divisible_sum(divisors, stop, expected):
+    assert DivisibleSum(divisors, stop)(stop) == expected
+
+
+def test_divisible_sum_queries():
+    divisible_sum = DivisibleSum([6, 10, 15, 7], 1000)
+    for stop in range(1, 1001):
+        assert divisible_sum(stop) == sum_divisible_in_range([6, 10, 15, 7], stop)
+
+
+@pytest.mark.parametrize("limit, mod, expected", [(1, None, 0), (2, None, 2), (33, None, 10), (34, None, 44),
+                                                  (4000000, None, 4613732), (4000000, 1000, 732)])
+def test_even_fibonacci_sum(limit, mod, expected):
+    assert even_fibonacci_sum(limit, mod=mod) == expected
+
+
+def test_even_fibonacci_sum_big():
+    limit = 10 ** 1000
+    expected = sum(f for f in takewhile(lambda f: f <= limit, fibonacci()) if f % 2 == 0)
+    assert even_fibonacci_sum(limit) == expected
+    assert even_fibonacci_sum(limit, mod=10 ** 9 + 7) == expected % (10 ** 9 + 7)
+
+
+largest_prime_factor_table = [
+    (1, 1),
+    (2, 2),
+    (10, 5),
+    (13195, 29),
+    (600851475143, 6857),
+    (999983 * 999979, 999983),
+    (2 ** 40, 2),
+    (1000003 ** 2, 1000003),
+    ((2 ** 61 - 1) * 1000003, 2 ** 61 - 1),
+]
+
+
+@pytest.mark.parametrize("num, expected", largest_prime_factor_table)
+def test_largest_prime_factor(num, expected):
+    assert largest_prime_factor(num) == expected
+
+
+def test_factorization_cache():
+    num = 999983 * 999979 * 12
+    assert factorization(num) == (2, 2, 3, 999979, 999983)
+    hits = factorization.cache_info().hits
+    assert largest_prime_factor(num) == 999983
+    assert factorization.cache_info().hits == hits + 1
+
+
+@pytest.mark.parametrize("num", [0, -12])
+def test_factorization_invalid(num):
+    with pytest.raises(AssertionError):
+        factorization(num)
+    with pytest.raises(AssertionError):
+        largest_prime_factor(num)
+
+
+def test_nth_prime_bounds():
+    primes = eratosthenes_sieve(10 ** 6)
+    for n in range(1, len(primes) + 1, 97):
+        lower, upper = nth_prime_bounds(n)
+        assert lower <= primes[n - 1] <= upper
+
+
+def test_first_primes():
+    assert list(first_primes(0)) == []
+    assert list(first_primes(6)) == [2, 3, 5, 7, 11, 13]
+    assert list(first_primes(10001)) == list(eratosthenes_sieve(104743))